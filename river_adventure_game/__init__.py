@@ -0,0 +1,6 @@
+"""River Adventure, a Pygame river navigation game.
+
+Importing the package does not open a window; the simulation in ``world``
+runs headless, and ``game.main()`` starts the interactive game.
+"""
+from .world import World, INPUT_LEFT, INPUT_RIGHT
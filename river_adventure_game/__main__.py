@@ -0,0 +1,54 @@
+import argparse
+
+from .game import main
+from .replay import MAX_SEED
+
+
+def window_size(text):
+    """Parse WIDTHxHEIGHT"""
+    try:
+        width, height = (int(part) for part in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'expected WIDTHxHEIGHT, got {text!r}')
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f'window size must be positive, got {text!r}')
+    return width, height
+
+
+def seed(text):
+    """Parse a seed that fits in a replay"""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'expected a whole number, got {text!r}')
+    if not 0 <= value <= MAX_SEED:
+        raise argparse.ArgumentTypeError(f'seed must be between 0 and {MAX_SEED}, got {text!r}')
+    return value
+
+
+parser = argparse.ArgumentParser(prog='python -m river_adventure_game')
+parser.add_argument('--seed', type=seed, help='seed for the river layout')
+parser.add_argument('--record', metavar='PATH',
+                    help='write a replay of the last game to PATH')
+parser.add_argument('--dirty-rects', action='store_true',
+                    help='keep the river still and only update changed screen regions')
+parser.add_argument('--profile', action='store_true',
+                    help='show the frame profiler overlay (toggle with F3)')
+parser.add_argument('--profile-out', metavar='PATH',
+                    help='write per-frame timings to PATH, CSV or .jsonl')
+parser.add_argument('--window', type=window_size, metavar='WxH',
+                    help='initial window size, the game is scaled to fit')
+parser.add_argument('--fullscreen', action='store_true', help='scale the game to the whole display')
+parser.add_argument('--gpu', action='store_true',
+                    help='draw with the accelerated SDL renderer if there is one')
+parser.add_argument('--chunked', action='store_true',
+                    help='play a generated river that gets harder the further you go')
+parser.add_argument('--scores', metavar='PATH',
+                    help='high score and telemetry database (default ~/.local/share/river_adventure_game/scores.db)')
+parser.add_argument('--no-scores', action='store_true', help="don't read or save scores")
+parser.add_argument('--threaded', action='store_true',
+                    help='simulate on a separate thread and draw interpolated frames at the display rate')
+args = parser.parse_args()
+main(args.seed, args.record, args.dirty_rects, args.profile, args.profile_out,
+     args.window, args.fullscreen, args.gpu, args.chunked, args.scores, not args.no_scores,
+     args.threaded)
@@ -0,0 +1,146 @@
+"""Lazy, cached asset loading.
+
+AssetManager loads each image the first time it is asked for. The decoded
+and scaled/rotated pixels are also written to a disk cache keyed by a hash
+of the source file and the requested size and rotation, so later starts
+read raw pixels instead of decoding and resampling PNGs. preload() starts
+loading a list of images on a background thread, e.g. while the start
+screen animates; asking for an image that is still being preloaded waits
+for that load instead of starting another. mask() builds a collision mask
+from an image once and keeps it next to the image.
+"""
+import hashlib
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets')
+
+# Bump when the cache file layout or preprocessing changes
+CACHE_VERSION = 1
+# Width and height of the pixels that follow, as RGBA bytes
+CACHE_HEADER = struct.Struct('<II')
+
+
+def default_cache_dir():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'river_adventure_game')
+
+
+class AssetManager:
+    """Loads images from assets_dir on first use, caching them in memory and on disk.
+
+    cache_dir=None uses ~/.cache/river_adventure_game (or $XDG_CACHE_HOME),
+    False disables the disk cache.
+    """
+
+    def __init__(self, assets_dir=ASSETS_DIR, cache_dir=None):
+        self.assets_dir = assets_dir
+        self.cache_dir = default_cache_dir() if cache_dir is None else cache_dir
+        self._images = {}
+        self._masks = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def image(self, filename, size=None, rotate=0):
+        """The converted image, rotated by rotate degrees and then scaled to size.
+
+        Raises pygame.error or FileNotFoundError if the file can't be loaded.
+        """
+        key = (filename, size, rotate)
+        image = self._images.get(key)
+        if image is None:
+            with self._lock:
+                future = self._pending.pop(key, None)
+            surface = future.result() if future else self._load(filename, size, rotate)
+            image = self._images[key] = self._convert(surface)
+        return image
+
+    def mask(self, filename, size=None, rotate=0):
+        """Collision mask of the image, built on first use.
+
+        Raises like image().
+        """
+        key = (filename, size, rotate)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._masks[key] = pygame.mask.from_surface(self.image(filename, size, rotate))
+        return mask
+
+    def preload(self, specs):
+        """Start loading (filename, size, rotate) specs on a background thread"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(1, thread_name_prefix='assets')
+            for filename, size, rotate in specs:
+                key = (filename, size, rotate)
+                if key not in self._images and key not in self._pending:
+                    self._pending[key] = self._executor.submit(self._load, filename, size, rotate)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @staticmethod
+    def _convert(surface):
+        if pygame.display.get_surface() is not None:
+            return surface.convert_alpha()
+        return surface
+
+    def _load(self, filename, size, rotate):
+        """Decode and preprocess an image, going through the disk cache"""
+        path = os.path.join(self.assets_dir, filename)
+        with open(path, 'rb') as f:
+            source = f.read()
+        cache_path = None
+        if self.cache_dir:
+            digest = hashlib.sha1(source).hexdigest()
+            size_name = f'{size[0]}x{size[1]}' if size else 'orig'
+            cache_path = os.path.join(self.cache_dir,
+                                      f'{digest}-{size_name}-r{rotate}-v{CACHE_VERSION}.rgba')
+            surface = self._read_cache(cache_path)
+            if surface is not None:
+                return surface
+
+        surface = pygame.image.load(path, filename)
+        if rotate:
+            surface = pygame.transform.rotate(surface, rotate)
+        if size:
+            surface = pygame.transform.scale(surface, size)
+        if cache_path:
+            self._write_cache(cache_path, surface)
+        return surface
+
+    @staticmethod
+    def _read_cache(path):
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < CACHE_HEADER.size:
+            return None
+        width, height = CACHE_HEADER.unpack_from(data)
+        pixels = data[CACHE_HEADER.size:]
+        if len(pixels) != width * height * 4:
+            return None
+        return pygame.image.frombytes(pixels, (width, height), 'RGBA')
+
+    @staticmethod
+    def _write_cache(path, surface):
+        # A cache that can't be written, e.g. on a read-only card, only
+        # costs speed
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(CACHE_HEADER.pack(*surface.get_size()))
+                f.write(pygame.image.tobytes(surface, 'RGBA'))
+            os.replace(temp_path, path)
+        except OSError:
+            pass
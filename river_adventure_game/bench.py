@@ -0,0 +1,185 @@
+"""Self-play evaluation runner.
+
+Plays many headless games with a scripted policy, sharding the seeds over a
+process pool, and prints aggregate statistics. Workers send back only a small
+(seed, score, ticks, cause) record per game, so the cost of IPC stays flat
+however long the games run.
+
+    python -m river_adventure_game.bench --games 100000 --workers 16 --policy greedy
+
+With --broad-phase it instead times the collision grid against a plain
+colliderect loop at increasing object counts.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from functools import partial
+
+from .constants import TICK_RATE, STONE_SPAWN_RATE, COIN_SPAWN_RATE, MAGNET_SPAWN_RATE
+from .level import LevelGenerator
+from .masks import SpriteMasks
+from .policies import POLICIES, make_policy
+from .profiler import percentile
+from .spatial import benchmark as broad_phase_benchmark
+from .world import World
+
+# Death causes reported per game
+CAUSE_STONE = 'stone'
+CAUSE_TIMEOUT = 'timeout'
+
+# SpriteMasks shared by the games of this process, built on first use
+_masks = None
+
+
+def _sprite_masks():
+    global _masks
+    if _masks is None:
+        _masks = SpriteMasks()
+    return _masks
+
+
+def play_game(seed, policy_name, max_ticks, chunked=False, precise=False, **rates):
+    """Play one game and return (seed, score, ticks, death cause)"""
+    level = LevelGenerator(seed) if chunked else None
+    masks = _sprite_masks() if precise else None
+    world = World(seed, level=level, masks=masks, **rates)
+    policy = make_policy(policy_name, seed)
+    step = world.step
+    while not world.game_over and world.ticks < max_ticks:
+        step(policy(world))
+    cause = CAUSE_STONE if world.game_over else CAUSE_TIMEOUT
+    return seed, world.score, world.ticks, cause
+
+
+def play_shard(shard, policy_name, max_ticks, rates, chunked=False, precise=False):
+    return [play_game(seed, policy_name, max_ticks, chunked, precise, **rates)
+            for seed in range(*shard)]
+
+
+def shards(first_seed, games, size):
+    for start in range(first_seed, first_seed + games, size):
+        yield start, min(start + size, first_seed + games)
+
+
+def summarize(scores, ticks, causes):
+    scores = sorted(scores)
+    ticks = sorted(ticks)
+    games = len(scores)
+    return {
+        'games': games,
+        'score_mean': sum(scores) / games if games else 0,
+        'score_p10': percentile(scores, 0.1),
+        'score_p50': percentile(scores, 0.5),
+        'score_p90': percentile(scores, 0.9),
+        'score_max': scores[-1] if scores else 0,
+        'ticks_mean': sum(ticks) / games if games else 0,
+        'ticks_p10': percentile(ticks, 0.1),
+        'ticks_p50': percentile(ticks, 0.5),
+        'ticks_p90': percentile(ticks, 0.9),
+        'causes': dict(causes),
+    }
+
+
+def run(games, workers, policy_name, max_ticks, first_seed=0, rates=None, out=None, chunked=False,
+        precise=False):
+    """Play games over a pool of workers and return the summary dict.
+
+    If out is a file object, one JSON line per game is written to it as the
+    results come in.
+    """
+    rates = rates or {}
+    shard_size = max(1, min(1000, games // (workers * 8)))
+    job = partial(play_shard, policy_name=policy_name, max_ticks=max_ticks, rates=rates,
+                  chunked=chunked, precise=precise)
+    scores = []
+    ticks = []
+    causes = Counter()
+
+    def collect(results):
+        for seed, score, game_ticks, cause in results:
+            scores.append(score)
+            ticks.append(game_ticks)
+            causes[cause] += 1
+            if out:
+                out.write(json.dumps({'seed': seed, 'score': score,
+                                      'ticks': game_ticks, 'cause': cause}) + '\n')
+
+    if workers == 1:
+        for shard in shards(first_seed, games, shard_size):
+            collect(job(shard))
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            for results in pool.imap_unordered(job, shards(first_seed, games, shard_size)):
+                collect(results)
+    return summarize(scores, ticks, causes)
+
+
+def print_broad_phase(ticks=200):
+    print(f"{'objects':>8} {'naive ms/tick':>14} {'grid ms/tick':>13} {'speedup':>8}")
+    for count, naive, gridded in broad_phase_benchmark(ticks=ticks):
+        print(f'{count:>8} {naive * 1000 / ticks:>14.3f} {gridded * 1000 / ticks:>13.3f} '
+              f'{naive / gridded:>7.1f}x')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m river_adventure_game.bench')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--policy', choices=POLICIES, default='greedy')
+    parser.add_argument('--seed', type=int, default=0, help='first seed, games use consecutive seeds')
+    parser.add_argument('--max-ticks', type=int, default=TICK_RATE * 60 * 10,
+                        help='end a game as a timeout after this many ticks')
+    parser.add_argument('--stone-rate', type=int, default=STONE_SPAWN_RATE)
+    parser.add_argument('--coin-rate', type=int, default=COIN_SPAWN_RATE)
+    parser.add_argument('--magnet-rate', type=int, default=MAGNET_SPAWN_RATE)
+    parser.add_argument('--chunked', action='store_true',
+                        help='play generated rivers instead of random spawn rolls')
+    parser.add_argument('--precise', action='store_true',
+                        help='pixel-precise collisions, as the game plays, instead of boxes')
+    parser.add_argument('--out', metavar='PATH', help='write per-game results as JSON lines')
+    parser.add_argument('--json', action='store_true', help='print the summary as JSON')
+    parser.add_argument('--broad-phase', action='store_true',
+                        help='benchmark the collision grid instead of playing games')
+    args = parser.parse_args(argv)
+
+    if args.broad_phase:
+        print_broad_phase()
+        return 0
+
+    rates = {
+        'stone_spawn_rate': args.stone_rate,
+        'coin_spawn_rate': args.coin_rate,
+        'magnet_spawn_rate': args.magnet_rate,
+    }
+    out = open(args.out, 'w') if args.out else None
+    start = time.perf_counter()
+    try:
+        summary = run(args.games, max(1, args.workers), args.policy, args.max_ticks,
+                      args.seed, rates, out, args.chunked, args.precise)
+    finally:
+        if out:
+            out.close()
+    elapsed = time.perf_counter() - start
+    summary['seconds'] = elapsed
+    summary['games_per_second'] = args.games / elapsed if elapsed > 0 else 0
+
+    if args.json:
+        print(json.dumps(summary))
+    else:
+        print(f"{summary['games']} games, policy {args.policy}, "
+              f"{'precise' if args.precise else 'box'} collisions, "
+              f"{summary['games_per_second']:.0f} games/s on {args.workers} workers")
+        print(f"score  mean {summary['score_mean']:.1f}  p10 {summary['score_p10']}  "
+              f"p50 {summary['score_p50']}  p90 {summary['score_p90']}  max {summary['score_max']}")
+        print(f"ticks  mean {summary['ticks_mean']:.0f}  p10 {summary['ticks_p10']}  "
+              f"p50 {summary['ticks_p50']}  p90 {summary['ticks_p90']}")
+        print('deaths ' + '  '.join(f'{cause} {count}' for cause, count in sorted(summary['causes'].items())))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""Game constants shared by the simulation and the renderer"""
+
+# Game constants. Positions and sizes are in virtual pixels of a
+# WINDOW_WIDTH x WINDOW_HEIGHT screen, which the display scales to the window.
+WINDOW_WIDTH = 800
+WINDOW_HEIGHT = 600
+FPS = 60
+TICK_RATE = 60  # Fixed simulation steps per second
+TICK_SECONDS = 1.0 / TICK_RATE
+MAX_FPS = 0  # Render frame cap, 0 renders as fast as possible
+MAX_FRAME_TIME = 0.25  # Longest frame fed to the simulation, in seconds
+
+# Colors
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+BLUE = (0, 0, 255)
+RED = (255, 0, 0)
+YELLOW = (255, 255, 0)
+GREEN = (0, 255, 0)
+
+# Game variables
+BOAT_WIDTH = 70
+BOAT_HEIGHT = 100
+STONE_WIDTH = 200
+STONE_HEIGHT = 40
+COIN_SIZE = 30
+MAGNET_SIZE = 35
+SCROLL_SPEED = 3
+PLAYER_SPEED = 5
+STONE_SPAWN_RATE = 60  # Lower is more frequent
+COIN_SPAWN_RATE = 80   # Lower is more frequent
+MAGNET_SPAWN_RATE = 300  # Lower is more frequent
+MAGNET_DURATION = 5  # seconds
+INVULNERABLE_DURATION = 1  # seconds
+CRASH_EFFECT_DURATION = 0.3  # seconds
+
+# Sprite images: attribute, file, size, rotation and placeholder color
+SPRITES = (
+    ('boat_img', 'boat.png', (BOAT_WIDTH, BOAT_HEIGHT), 0, BLUE),
+    ('coin_img', 'coin.png', (COIN_SIZE, COIN_SIZE), 0, YELLOW),
+    ('stone_img', 'stone.png', (STONE_WIDTH, STONE_HEIGHT), 0, RED),
+    # Rotate the magnet image 90 degrees counterclockwise
+    ('magnet_img', 'magnet.png', (MAGNET_SIZE, MAGNET_SIZE), 90, GREEN),
+)
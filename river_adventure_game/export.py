@@ -0,0 +1,232 @@
+"""Offscreen export of recorded runs.
+
+Re-simulates a replay on SDL's dummy video driver and draws every frame
+with the game's own Renderer, HUD included. The result is a sequence of
+TGA or PNG images, or a single raw stream of the window's own 32-bit pixels,
+which ffmpeg reads as bgr0:
+
+    python -m river_adventure_game.export run.rar --out frames/
+    ffmpeg -r 60 -i frames/frame_%06d.tga run.mp4
+    python -m river_adventure_game.export run.rar --out run.raw --format raw
+    ffmpeg -f rawvideo -pix_fmt bgr0 -s 800x600 -r 60 -i run.raw run.mp4
+
+TGA frames are run-length encoded, which is several times quicker than
+PNG's deflate; PNG makes the smallest files but on one core takes longer
+than the run itself.
+
+Encoding runs on a process pool. Drawn frames are copied straight from the
+window's pixel buffer into a ring of shared memory slots, and workers read
+them from there, so pixels are never pickled. The main process waits for
+the oldest frame whenever all slots are busy, which bounds memory however
+long the run is. Raw frames are written by the workers straight from
+their slot to the frame's offset in the output file, so the stream comes
+out in order without any pixel conversion.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool, shared_memory
+
+import pygame
+
+from .constants import WINDOW_WIDTH, WINDOW_HEIGHT, TICK_RATE
+from .level import LevelGenerator
+from .masks import SpriteMasks
+from .particles import Snowfall
+from .render import Renderer
+from .replay import Replay, ReplayError
+from .world import World
+
+FORMATS = ('tga', 'png', 'raw')
+# Channel masks of the window the export draws on, B, G, R, X in memory
+PIXEL_MASKS = (0xff0000, 0xff00, 0xff, 0)
+# Shared memory frame slots per worker
+SLOTS_PER_WORKER = 2
+
+# Per-worker state, set up by _init_worker
+_worker = None
+
+
+class _Encoder:
+    """Turns window pixel buffers into files"""
+
+    def __init__(self, out, fmt, size, pitch):
+        self.out = out
+        self.fmt = fmt
+        self.surface = None
+        self.fd = None
+        if fmt == 'raw':
+            self.fd = os.open(out, os.O_WRONLY | os.O_CREAT, 0o644)
+        else:
+            # Same layout as the window, so its buffer can be copied in as is
+            self.surface = pygame.Surface(size, 0, 32, PIXEL_MASKS)
+            if self.surface.get_pitch() != pitch:
+                raise ValueError('unexpected window pixel layout')
+
+    def encode(self, index, pixels):
+        """Write frame index from a buffer of the window's pixels"""
+        if self.fd is not None:
+            os.pwrite(self.fd, pixels, index * len(pixels))
+            return
+        surface = self.surface
+        with memoryview(surface.get_buffer()) as view:
+            view[:] = pixels
+        pygame.image.save(surface, os.path.join(self.out, f'frame_{index:06d}.{self.fmt}'))
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+
+
+def _init_worker(memory_name, slot_size, out, fmt, size, pitch):
+    global _worker
+    memory = shared_memory.SharedMemory(memory_name)
+    _worker = (memory, slot_size, _Encoder(out, fmt, size, pitch))
+
+
+def _encode_slot(slot, index):
+    memory, slot_size, encoder = _worker
+    encoder.encode(index, memory.buf[slot * slot_size:(slot + 1) * slot_size])
+    return slot
+
+
+def frames(replay, renderer, fps=TICK_RATE):
+    """Draw the replay, yielding after each frame due at fps.
+
+    Frame k shows the tick closest to k / fps seconds into the run, so
+    the frames keep to simulated time whether or not fps divides TICK_RATE.
+    """
+    level = LevelGenerator(replay.seed) if replay.chunked else None
+    masks = SpriteMasks(renderer.assets) if replay.precise else None
+    world = World(replay.seed, level=level, masks=masks)
+    particles = Snowfall(30, seed=replay.seed)
+    # Screen shake draws from the global RNG, seed it for repeatable output
+    random.seed(replay.seed)
+    count = 0
+    due = 0
+    try:
+        for tick, inputs in enumerate(replay.inputs):
+            world.step(inputs)
+            particles.update()
+            if tick == due:
+                renderer.draw_world(world, particles)
+                yield
+                count += 1
+                due = round(count * TICK_RATE / fps)
+    finally:
+        if level is not None:
+            level.close()
+
+
+def export(replay, out, fmt='tga', workers=None, fps=TICK_RATE):
+    """Write the replay's frames to out, a directory for images or a raw file.
+
+    fps must be positive, and is capped at TICK_RATE, one frame per tick.
+    Returns the number of frames written.
+    """
+    if fps <= 0:
+        raise ValueError(f'frame rate must be positive, got {fps}')
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    # There is no event loop to turn SDL's SIGINT and SIGTERM into quits,
+    # and forked workers would inherit its handlers and ignore the pool
+    os.environ['SDL_NO_SIGNAL_HANDLERS'] = '1'
+    workers = workers or os.cpu_count() or 1
+    fps = min(fps, TICK_RATE)
+    if fmt == 'raw':
+        # Start empty, the workers fill in frames by offset
+        open(out, 'wb').close()
+    else:
+        os.makedirs(out, exist_ok=True)
+
+    pygame.init()
+    try:
+        window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        if window.get_bitsize() != 32 or window.get_masks() != PIXEL_MASKS:
+            raise ValueError(f'unsupported window pixel format {window.get_masks()}')
+        renderer = Renderer(window)
+        size = window.get_size()
+        pitch = window.get_pitch()
+        slot_size = pitch * size[1]
+        count = 0
+
+        if workers == 1:
+            encoder = _Encoder(out, fmt, size, pitch)
+            try:
+                for _ in frames(replay, renderer, fps):
+                    encoder.encode(count, memoryview(window.get_buffer()))
+                    count += 1
+            finally:
+                encoder.close()
+            return count
+
+        slots = workers * SLOTS_PER_WORKER
+        memory = shared_memory.SharedMemory(create=True, size=slots * slot_size)
+        try:
+            with Pool(workers, _init_worker,
+                      (memory.name, slot_size, out, fmt, size, pitch)) as pool:
+                free = list(range(slots))
+                pending = deque()
+                for _ in frames(replay, renderer, fps):
+                    if not free:
+                        # Every slot is being encoded, wait for the oldest
+                        free.append(pending.popleft().get())
+                    slot = free.pop()
+                    memory.buf[slot * slot_size:(slot + 1) * slot_size] = window.get_buffer()
+                    pending.append(pool.apply_async(_encode_slot, (slot, count)))
+                    count += 1
+                for result in pending:
+                    result.get()
+                pool.close()
+                pool.join()
+        finally:
+            memory.close()
+            memory.unlink()
+        return count
+    finally:
+        pygame.quit()
+
+
+def frame_rate(text):
+    """Parse a positive --fps"""
+    try:
+        fps = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'expected a whole number, got {text!r}')
+    if fps <= 0:
+        raise argparse.ArgumentTypeError(f'frame rate must be positive, got {text!r}')
+    return fps
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m river_adventure_game.export')
+    parser.add_argument('replay', help='replay file to render')
+    parser.add_argument('--out', required=True,
+                        help='directory for image frames, or the file for a raw stream')
+    parser.add_argument('--format', choices=FORMATS, default='tga',
+                        help='TGA or PNG sequence, or raw bgr0 frames (default tga)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='encoding processes')
+    parser.add_argument('--fps', type=frame_rate, default=TICK_RATE,
+                        help=f'frames per second of play to export (default and most '
+                             f'{TICK_RATE}, one per tick)')
+    args = parser.parse_args(argv)
+
+    try:
+        replay = Replay.load(args.replay)
+    except (OSError, ReplayError) as e:
+        print(f'{args.replay}: ERROR {e}')
+        return 1
+    start = time.perf_counter()
+    count = export(replay, args.out, args.format, max(1, args.workers), args.fps)
+    elapsed = time.perf_counter() - start
+    played = replay.ticks / TICK_RATE
+    print(f'{count} frames at {min(args.fps, TICK_RATE)} fps of {played:.1f}s of play '
+          f'in {elapsed:.1f}s ({played / elapsed:.1f}x real time) to {args.out}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,485 @@
+import gc
+import pygame
+import random
+import sqlite3
+import sys
+import math
+import time
+from pygame.locals import *
+
+from .constants import (
+    WINDOW_WIDTH, WINDOW_HEIGHT, FPS, TICK_SECONDS, MAX_FPS, MAX_FRAME_TIME,
+    WHITE, BLACK, YELLOW, BOAT_WIDTH, COIN_SIZE,
+)
+from .gpu import open_window
+from .level import LevelGenerator
+from .masks import SpriteMasks
+from .particles import Snowfall
+from .profiler import FrameProfiler
+from .render import Renderer
+from .replay import Recorder
+from .scores import ScoreStore, session_row
+from .text import quantize
+from .threaded import SimulationThread, interpolate
+from .world import World, inputs_from_keys
+
+try:
+    from pygame._sdl2.video import Window
+except ImportError:
+    Window = None
+
+
+def init_display(dirty_rects=False, window_size=None, fullscreen=False, gpu=False, vsync=False):
+    """Open the game window and return a Renderer and a Clock for it.
+
+    Everything is drawn onto a WINDOW_WIDTH x WINDOW_HEIGHT surface that
+    SDL scales to the window, letterboxed, so a large display costs the
+    same drawing work as a small one. window_size is the initial window
+    size in real pixels; by default SDL picks the largest whole multiple of
+    the game size that fits the desktop.
+
+    With gpu=True game frames are drawn through SDL's accelerated renderer
+    if there is one, falling back to software drawing otherwise. vsync=True
+    asks for presenting to wait for the display refresh.
+    """
+    pygame.init()
+    if gpu:
+        renderer = open_window('River Adventure', window_size, fullscreen, vsync=vsync)
+        if renderer is not None:
+            return renderer, pygame.time.Clock()
+        print("Warning: No accelerated renderer available, using software drawing")
+    # Set up the window
+    flags = pygame.SCALED | pygame.RESIZABLE
+    if fullscreen:
+        flags |= pygame.FULLSCREEN
+    try:
+        window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), flags, vsync=int(vsync))
+    except pygame.error:
+        # Not every driver can sync, draw unpaced instead
+        window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), flags)
+    if window_size and not fullscreen:
+        if Window is not None:
+            Window.from_display_module().size = window_size
+        else:
+            print("Warning: Can't resize the window with this pygame, using the default size")
+    pygame.display.set_caption('River Adventure')
+    return Renderer(window, dirty_rects), pygame.time.Clock()
+
+
+def draw_start_screen(renderer, elapsed, particles, best=None):
+    """Draw one frame of the start screen, elapsed seconds into it.
+
+    best is a list of (score, ticks, finished_at) rows to show as the high
+    scores, or None while they are still loading.
+    """
+    window = renderer.window
+    font = renderer.font
+    big_font = renderer.big_font
+    text = renderer.text.render
+    sprites = renderer.sprites
+
+    # Draw background and overlay - same as the main game and end screen
+    if not renderer.draw_backdrop():
+        # Use the same fallback as the main game
+        window.fill((0, 0, 100))  # Dark blue water
+
+        # Add animated river current lines
+        for i in range(20):
+            y_pos = (i * 40 + elapsed * 30) % WINDOW_HEIGHT
+            line_width = random.randint(100, 300)
+            line_x = random.randint(0, WINDOW_WIDTH - line_width)
+            pygame.draw.line(window, (0, 0, 150),
+                            (line_x, y_pos),
+                            (line_x + line_width, y_pos), 2)
+
+        # Add dark overlay for night winter ocean feel
+        renderer.draw_overlay()
+
+    # Draw particles on top of overlay
+    particles.draw(window)
+
+    # Draw title at top center
+    renderer.draw_panel((WINDOW_WIDTH//2 - 300, 50, 600, 80), (20, 20, 40, 200))
+
+    # Draw title with shadow effect
+    title_shadow = text(big_font, 'River Adventure', BLACK)
+    title_text = text(big_font, 'River Adventure', WHITE)
+
+    # Add slight floating effect
+    title_y_offset = math.sin(elapsed * 1.5) * 3
+
+    # Draw shadow slightly offset
+    window.blit(title_shadow, (WINDOW_WIDTH//2 - title_shadow.get_width()//2 + 2,
+                              70 + 2 + title_y_offset))
+    # Draw main title
+    window.blit(title_text, (WINDOW_WIDTH//2 - title_text.get_width()//2,
+                            70 + title_y_offset))
+
+    # Create pulsing "Press SPACE to start" text at bottom, in a few
+    # steps so each shade is rendered only once
+    pulse_value = quantize((math.sin(elapsed * 3) + 1) / 2)
+    pulse_color = (
+        int(200 + 55 * pulse_value),
+        int(200 + 55 * pulse_value),
+        int(255 * pulse_value)
+    )
+
+    # Create button-like background for the start instruction
+    renderer.draw_panel((WINDOW_WIDTH//2 - 175, WINDOW_HEIGHT - 120, 350, 50),
+                        (10, 10, 30, 180 + int(pulse_value * 50)))
+
+    # Draw pulsing border around the start button
+    pygame.draw.rect(window, pulse_color,
+                    (WINDOW_WIDTH//2 - 175, WINDOW_HEIGHT - 120, 350, 50), 2)
+
+    instructions = text(font, 'Press SPACE to Start', pulse_color)
+    window.blit(instructions, (WINDOW_WIDTH//2 - instructions.get_width()//2,
+                              WINDOW_HEIGHT - 110))
+
+    # Draw styled control instructions
+    renderer.draw_panel((WINDOW_WIDTH//2 - 250, WINDOW_HEIGHT - 60, 500, 40), (10, 10, 20, 180))
+
+    controls = text(font, 'Use LEFT and RIGHT arrow keys to move', WHITE)
+    window.blit(controls, (WINDOW_WIDTH//2 - controls.get_width()//2,
+                          WINDOW_HEIGHT - 50))
+
+    # Draw animated boat in center
+    boat_x = WINDOW_WIDTH//2 - BOAT_WIDTH//2
+    boat_y = WINDOW_HEIGHT//2 + math.sin(elapsed * 2) * 8
+
+    window.blit(renderer.boat_img, (boat_x, boat_y))
+
+    # Draw coins around the boat
+    coin_positions = [
+        (WINDOW_WIDTH//2 - 150, WINDOW_HEIGHT//2 - 80, COIN_SIZE),
+        (WINDOW_WIDTH//2 + 120, WINDOW_HEIGHT//2 - 60, COIN_SIZE * 1.5),
+        (WINDOW_WIDTH//2 - 100, WINDOW_HEIGHT//2 + 100, COIN_SIZE * 1.2)
+    ]
+
+    for i, (x_pos, y_pos, size) in enumerate(coin_positions):
+        y_pos += math.sin(elapsed * 2 + i) * 8
+
+        scaled_coin = sprites.scaled(renderer.coin_img, (int(size), int(size)))
+        window.blit(scaled_coin, (x_pos, y_pos))
+
+    # High scores in a panel on the left
+    if best:
+        small_font = renderer.small_font
+        line_height = small_font.get_linesize()
+        renderer.draw_panel((20, 150, 160, 16 + line_height * (len(best) + 1)), (10, 10, 20, 180))
+        window.blit(text(small_font, 'Best runs', YELLOW), (30, 158))
+        for place, (score, _, _) in enumerate(best, 1):
+            window.blit(text(small_font, f'{place}.  {score}', WHITE),
+                        (30, 158 + line_height * place))
+
+
+def show_start_screen(renderer, clock, scores=None):
+    # Animation variables
+    start_time = pygame.time.get_ticks()
+    particles = Snowfall(20)
+    # Loaded in the background, shown once they arrive
+    best_future = scores.top_scores(5) if scores else None
+    best = None
+
+    waiting = True
+    while waiting:
+        current_time = pygame.time.get_ticks()
+        elapsed = (current_time - start_time) / 1000.0  # Time in seconds
+
+        # Handle events
+        for event in pygame.event.get():
+            if event.type == QUIT:
+                pygame.quit()
+                sys.exit()
+            if event.type == KEYDOWN and event.key == K_SPACE:
+                waiting = False
+
+        # Update particles
+        particles.update()
+
+        if best_future is not None and best_future.done():
+            best = None if best_future.exception() else best_future.result()
+            best_future = None
+        draw_start_screen(renderer, elapsed, particles, best)
+        renderer.present()
+        clock.tick(FPS)  # Cap the frame rate
+
+
+def draw_game_over(renderer, elapsed, score, rank=None):
+    """Draw one frame of the game over screen, elapsed seconds into it.
+
+    rank is (earlier runs scoring less, earlier runs) from the score store,
+    or None if it is not known (yet).
+    """
+    window = renderer.window
+    font = renderer.font
+    big_font = renderer.big_font
+    text = renderer.text.render
+    sprites = renderer.sprites
+
+    # Draw background and overlay - same as the start screen and main game
+    if not renderer.draw_backdrop():
+        # Use the same fallback as the main game
+        window.fill((0, 0, 100))  # Dark blue water
+
+        # Add some river current lines
+        for i in range(20):
+            y_pos = (i * 40 + elapsed * 50) % WINDOW_HEIGHT
+            line_width = random.randint(100, 300)
+            line_x = random.randint(0, WINDOW_WIDTH - line_width)
+            pygame.draw.line(window, (0, 0, 150),
+                            (line_x, y_pos),
+                            (line_x + line_width, y_pos), 2)
+
+        # Draw a darkened overlay to make text more visible
+        renderer.draw_overlay()
+
+    # Draw game over text with pulsing effect
+    pulse_value = quantize((math.sin(elapsed * 2) + 1) / 2)  # Value between 0 and 1
+    red_pulse = max(150, int(255 * pulse_value))
+    game_over_color = (red_pulse, 0, 0)  # Pulsing red
+
+    game_over_text = text(big_font, 'GAME OVER', game_over_color)
+    window.blit(game_over_text, (WINDOW_WIDTH//2 - game_over_text.get_width()//2,
+                                WINDOW_HEIGHT//3))
+
+    # Draw score with a highlight effect
+    renderer.draw_panel((WINDOW_WIDTH//2 - 150, WINDOW_HEIGHT//2 - 10, 300, 60), (0, 0, 0, 150))
+
+    score_text = text(font, f'Final Score: {score}', YELLOW)  # Use coin color for score
+    window.blit(score_text, (WINDOW_WIDTH//2 - score_text.get_width()//2, WINDOW_HEIGHT//2))
+
+    if rank is not None:
+        below, runs = rank
+        if runs:
+            rank_line = f'Better than {below * 100 // runs}% of {runs} earlier runs'
+        else:
+            rank_line = 'First recorded run'
+        rank_text = text(renderer.small_font, rank_line, WHITE)
+        window.blit(rank_text, (WINDOW_WIDTH//2 - rank_text.get_width()//2, WINDOW_HEIGHT//2 + 28))
+
+    # Draw instruction buttons with a style matching the game
+    renderer.draw_panel((WINDOW_WIDTH//2 - 175, WINDOW_HEIGHT//2 + 60, 350, 40), (0, 0, 100, 150))
+
+    restart_text = text(font, 'Press SPACE to play again', WHITE)
+    window.blit(restart_text, (WINDOW_WIDTH//2 - restart_text.get_width()//2,
+                              WINDOW_HEIGHT//2 + 65))
+
+    renderer.draw_panel((WINDOW_WIDTH//2 - 100, WINDOW_HEIGHT//2 + 120, 200, 40), (100, 0, 0, 150))
+
+    quit_text = text(font, 'Press Q to quit', WHITE)
+    window.blit(quit_text, (WINDOW_WIDTH//2 - quit_text.get_width()//2,
+                           WINDOW_HEIGHT//2 + 125))
+
+    # Draw some game elements in the background
+
+    # Draw twinkling particles
+    for i in range(50):
+        x_pos = random.randint(0, WINDOW_WIDTH)
+        y_pos = random.randint(0, WINDOW_HEIGHT)
+        particle_alpha = random.randint(50, 200)
+        particle_size = random.randint(1, 4)
+
+        particle_surface = sprites.circle(particle_size, (255, 255, 255, particle_alpha))
+        window.blit(particle_surface, (x_pos, y_pos))
+
+
+def show_game_over(renderer, clock, score, rank_future=None):
+    # Animation variables
+    start_time = pygame.time.get_ticks()
+    rank = None
+
+    waiting = True
+    while waiting:
+        current_time = pygame.time.get_ticks()
+        elapsed = (current_time - start_time) / 1000.0  # Time in seconds
+
+        # Handle events
+        for event in pygame.event.get():
+            if event.type == QUIT:
+                pygame.quit()
+                sys.exit()
+            if event.type == KEYDOWN:
+                if event.key == K_SPACE:
+                    waiting = False
+                if event.key == K_q:
+                    pygame.quit()
+                    sys.exit()
+
+        if rank_future is not None and rank_future.done():
+            rank = None if rank_future.exception() else rank_future.result()
+            rank_future = None
+        draw_game_over(renderer, elapsed, score, rank)
+        renderer.present()
+        clock.tick(FPS)
+
+
+def play(renderer, clock, world, recorder=None):
+    """Run the interactive game loop until the world is over.
+
+    The world is stepped at a fixed TICK_RATE from an accumulator of real
+    frame time, while drawing happens as often as MAX_FPS allows, so a slow
+    frame delays the picture but never changes the gameplay. If a recorder
+    is given, the inputs of every tick are passed to it.
+    """
+    particles = Snowfall(30)
+    renderer.reset_dirty_rects()
+    accumulator = 0.0
+    previous = time.perf_counter()
+
+    profiler = renderer.profiler
+    world.profiler = profiler
+
+    # Main game loop
+    while not world.game_over:
+        if profiler:
+            profiler.begin_frame()
+        # Process events
+        for event in pygame.event.get():
+            if event.type == QUIT:
+                pygame.quit()
+                sys.exit()
+            if event.type == KEYDOWN and event.key == K_F3:
+                renderer.show_profiler = not renderer.show_profiler
+                renderer.reset_dirty_rects()
+
+        now = time.perf_counter()
+        accumulator += min(now - previous, MAX_FRAME_TIME)
+        previous = now
+
+        # Get key presses
+        inputs = inputs_from_keys(pygame.key.get_pressed())
+        if profiler:
+            profiler.lap('events')
+        while accumulator >= TICK_SECONDS and not world.game_over:
+            world.step(inputs)
+            if recorder:
+                recorder.record(inputs)
+            # Update particles
+            particles.update()
+            accumulator -= TICK_SECONDS
+            if profiler:
+                profiler.lap('update')
+
+        renderer.present(renderer.draw_world(world, particles))
+        if profiler:
+            profiler.lap('display')
+        clock.tick(MAX_FPS)
+        if profiler:
+            profiler.lap('wait')
+            profiler.end_frame(world)
+
+
+def play_threaded(renderer, clock, world, recorder=None):
+    """Run the game with the world stepped on a SimulationThread.
+
+    This thread only handles events and draws, interpolating between the
+    last two ticks, so frames may come at any rate and a stalled frame
+    never holds up the simulation.
+    """
+    particles = Snowfall(30)
+    renderer.reset_dirty_rects()
+    profiler = renderer.profiler
+    # The profiler belongs to this thread, the simulation can't lap it
+    world.profiler = None
+    simulation = SimulationThread(world, recorder)
+    simulation.start()
+    particle_ticks = 0
+
+    try:
+        while True:
+            if profiler:
+                profiler.begin_frame()
+            for event in pygame.event.get():
+                if event.type == QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type == KEYDOWN and event.key == K_F3:
+                    renderer.show_profiler = not renderer.show_profiler
+                    renderer.reset_dirty_rects()
+            simulation.inputs = inputs_from_keys(pygame.key.get_pressed())
+            if profiler:
+                profiler.lap('events')
+
+            snapshots = simulation.snapshots()
+            latest = snapshots[1]
+            if latest.game_over:
+                break
+            # Particles keep to the simulation's ticks
+            while particle_ticks < latest.ticks:
+                particles.update()
+                particle_ticks += 1
+            view = interpolate(snapshots)
+            if profiler:
+                profiler.lap('update')
+
+            renderer.present(renderer.draw_world(view, particles))
+            if profiler:
+                profiler.lap('display')
+            clock.tick(MAX_FPS)
+            if profiler:
+                profiler.lap('wait')
+                profiler.end_frame(world)
+    finally:
+        simulation.stop()
+
+
+def main(seed=None, record_path=None, dirty_rects=False, show_profiler=False, profile_path=None,
+         window_size=None, fullscreen=False, gpu=False, chunked=False, scores_path=None,
+         keep_scores=True, threaded=False):
+    # The threaded mode draws in-between frames, so let the display's
+    # refresh rate pace them
+    renderer, clock = init_display(dirty_rects, window_size, fullscreen, gpu, vsync=threaded)
+    scores = None
+    if keep_scores:
+        try:
+            scores = ScoreStore(scores_path)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: Could not open the score database, scores won't be kept: {e}")
+    # Profiling is cheap enough to always run, F3 shows the overlay
+    renderer.profiler = FrameProfiler()
+    renderer.show_profiler = show_profiler
+    if profile_path:
+        renderer.profiler.open_dump(profile_path)
+    # Everything loaded so far lives for the whole session, keep the cyclic
+    # GC from rescanning it during play
+    gc.freeze()
+    try:
+        show_start_screen(renderer, clock, scores)
+        # Pixel-precise collision, from the images the start screen preloaded
+        masks = SpriteMasks(renderer.assets)
+
+        while True:
+            # Game setup
+            level = None
+            if chunked:
+                # Generate the upcoming river on a background thread
+                level_seed = seed if seed is not None else random.getrandbits(32)
+                level = LevelGenerator(level_seed, preload=True)
+                world = World(level_seed, level=level, masks=masks)
+            else:
+                world = World(seed, masks=masks)
+            recorder = Recorder(world) if record_path else None
+            if threaded:
+                play_threaded(renderer, clock, world, recorder)
+            else:
+                play(renderer, clock, world, recorder)
+            if level is not None:
+                level.close()
+            if recorder:
+                recorder.save(record_path)
+
+            # Game over
+            rank_future = None
+            if scores:
+                row = session_row(world, renderer.profiler.stats())
+                scores.record(row)
+                rank_future = scores.rank(world.score, before=row[0])
+            show_game_over(renderer, clock, world.score, rank_future)
+    finally:
+        # Quitting exits from inside the screens, drop any preloads still
+        # queued and flush the samples and the queued sessions first
+        renderer.assets.shutdown()
+        renderer.profiler.close_dump()
+        if scores:
+            scores.close()
@@ -0,0 +1,173 @@
+"""Hardware accelerated drawing through SDL2's renderer.
+
+TextureRenderer draws game frames with pygame._sdl2.video: every image,
+the backdrop strip and the particle stamps are uploaded as textures once
+and copied by the GPU, and the crash flash is a blended fill instead of a
+full-screen alpha blit. The menus keep drawing onto a software canvas,
+which is uploaded as one streaming texture per frame, so the two backends
+share all menu code.
+
+Opaque and color-keyed draws match the software renderer exactly; alpha
+blended pixels (text edges, overlays) may differ by a few levels because
+SDL and pygame round blends differently.
+"""
+import random
+
+import pygame
+
+from .constants import WINDOW_WIDTH, WINDOW_HEIGHT, BLACK, SCROLL_SPEED
+from .render import Renderer, CRASH_OVERLAY
+
+try:
+    from pygame._sdl2.video import Window, Renderer as SDLRenderer, Texture
+except ImportError:
+    Window = SDLRenderer = Texture = None
+
+# SDL_BLENDMODE_BLEND
+BLEND = 1
+# Color the frame is cleared to
+CLEAR_COLOR = (*BLACK, 255)
+
+
+def open_window(title, window_size=None, fullscreen=False, accelerated=1, vsync=False):
+    """Open a window with an SDL renderer and return a TextureRenderer for it.
+
+    Returns None if pygame lacks the SDL2 video module or no renderer with
+    the requested acceleration exists; accelerated=-1 accepts SDL's
+    software renderer too, e.g. for headless tests.
+    """
+    if Window is None:
+        return None
+    window = Window(title, window_size or (WINDOW_WIDTH, WINDOW_HEIGHT),
+                    resizable=True, fullscreen_desktop=fullscreen)
+    try:
+        gpu = SDLRenderer(window, accelerated=accelerated, vsync=vsync)
+    except (pygame.error, RuntimeError):
+        window.destroy()
+        return None
+    # Draw in game pixels and let SDL scale to the window
+    gpu.logical_size = (WINDOW_WIDTH, WINDOW_HEIGHT)
+    return TextureRenderer(gpu, window)
+
+
+class TextureRenderer(Renderer):
+    """Renderer that draws game frames through an SDL renderer.
+
+    self.window is a software canvas for the menus; present() shows it when
+    no game frame was drawn since the last present.
+    """
+
+    def __init__(self, gpu, sdl_window=None, assets=None):
+        super().__init__(pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)), False, assets)
+        self.gpu = gpu
+        self.sdl_window = sdl_window
+        self._textures = {}
+        # Latest (surface, texture) for things that get redrawn, like HUD lines
+        self._latest = {}
+        self._canvas = None
+        self._drew_world = False
+        gpu.draw_color = CLEAR_COLOR
+        gpu.clear()
+
+    def texture(self, surface):
+        """Texture of a surface that is kept around, uploaded on first use"""
+        texture = self._textures.get(surface)
+        if texture is None:
+            texture = self._textures[surface] = Texture.from_surface(self.gpu, surface)
+        return texture
+
+    def _latest_texture(self, key, surface):
+        """Texture of the current surface for key, replacing the previous one"""
+        latest = self._latest.get(key)
+        if latest is None or latest[0] is not surface:
+            latest = self._latest[key] = (surface, Texture.from_surface(self.gpu, surface))
+        return latest[1]
+
+    def _draw_line(self, atlas, pos, prefix, value, suffix=''):
+        line = atlas.line(prefix, value, suffix)
+        self._latest_texture(atlas, line).draw(dstrect=pos)
+
+    def draw_world(self, world, particles=None):
+        """Draw one frame of world state on the GPU, without presenting it"""
+        gpu = self.gpu
+        texture = self.texture
+        boat = world.boat
+        profiler = self.profiler
+
+        # Apply screen shake
+        screen_shake = world.screen_shake
+        shake_x = random.randint(-screen_shake, screen_shake) if screen_shake > 0 else 0
+        shake_y = random.randint(-screen_shake, screen_shake) if screen_shake > 0 else 0
+
+        # Scrolling background, as two wrapped copies of the strip
+        strip = self.backdrop()
+        strip_texture = texture(strip)
+        height = strip.get_height()
+        offset = world.ticks * SCROLL_SPEED % height
+        strip_texture.draw(dstrect=(0, offset))
+        if offset:
+            strip_texture.draw(dstrect=(0, offset - height))
+        if profiler:
+            profiler.lap('background')
+
+        if particles is not None:
+            for stamp, pos in particles.sprites():
+                texture(stamp).draw(dstrect=pos)
+
+        # Positions are truncated to whole pixels, as Surface.blit does
+        texture(self.boat_img).draw(dstrect=(int(boat.x + shake_x), int(boat.y + shake_y)))
+        stone_texture = texture(self.stone_img)
+        for stone in world.stones:
+            stone_texture.draw(dstrect=(int(stone.x + shake_x), int(stone.y + shake_y)))
+        coin_texture = texture(self.coin_img)
+        for coin in world.coins:
+            coin_texture.draw(dstrect=(int(coin.x + shake_x), int(coin.y + shake_y)))
+        magnet_texture = texture(self.magnet_img)
+        for magnet in world.magnets:
+            magnet_texture.draw(dstrect=(int(magnet.x + shake_x), int(magnet.y + shake_y)))
+
+        # Draw crash effect (red flash)
+        if world.crash_effect_active():
+            gpu.draw_blend_mode = BLEND
+            gpu.draw_color = CRASH_OVERLAY
+            gpu.fill_rect((0, 0, WINDOW_WIDTH, WINDOW_HEIGHT))
+        if profiler:
+            profiler.lap('blits')
+
+        # Draw score and health
+        self._draw_line(self.score_hud, (10, 10), 'Score: ', world.score)
+        self._draw_line(self.health_hud, (10, 50), 'Health: ', boat.health)
+
+        # Draw magnet timer if active
+        if world.magnet_active:
+            self._draw_line(self.magnet_hud, (10, 90), 'Magnet: ', world.magnet_time_left(), 's')
+
+        if self.show_profiler and profiler:
+            surface = self.profiler_surface()
+            self._latest_texture('profiler', surface).draw(
+                dstrect=(WINDOW_WIDTH - surface.get_width() - 10, 10))
+        if profiler:
+            profiler.lap('hud')
+
+        self._drew_world = True
+        return None
+
+    def present(self, rects=None):
+        """Show the frame: the GPU frame from draw_world(), else the canvas"""
+        gpu = self.gpu
+        if not self._drew_world:
+            if self._canvas is None:
+                self._canvas = Texture(gpu, self.window.get_size(), streaming=True)
+            self._canvas.update(self.window)
+            self._canvas.draw()
+        gpu.present()
+        # Start the next frame from black, like a fresh window
+        gpu.draw_color = CLEAR_COLOR
+        gpu.clear()
+        self._drew_world = False
+
+    def to_surface(self):
+        """The pixels drawn so far this frame, for tests and screenshots"""
+        if not self._drew_world:
+            return self.window.copy()
+        return self.gpu.to_surface()
@@ -0,0 +1,75 @@
+"""Cached full-screen layers.
+
+The tiled river background and the dark night overlay never change during
+play, so they are composited once into a single opaque surface that costs
+one plain blit per frame. The cache is keyed on everything the picture
+depends on and rebuilds itself when any of it changes.
+
+The backdrop is a strip at least as tall as the window whose height is a
+whole number of background tiles, so it wraps seamlessly and a scrolling
+river is just two blits of it.
+"""
+import pygame
+
+from .constants import BLACK
+
+# Dark overlay for night winter ocean feel
+NIGHT_OVERLAY = (0, 0, 0, 180)
+
+
+def tile(surface, image):
+    """Cover surface with copies of image, starting at the top left"""
+    width, height = surface.get_size()
+    tile_width, tile_height = image.get_size()
+    surface.blits([(image, (x, y))
+                   for y in range(0, height, tile_height)
+                   for x in range(0, width, tile_width)], False)
+
+
+class LayerCache:
+    def __init__(self):
+        self._key = None
+        self._backdrop = None
+        self._overlays = {}
+
+    def backdrop(self, size, background_img, fill=BLACK, overlay=NIGHT_OVERLAY):
+        """Return the background tiled over fill, darkened by overlay.
+
+        background_img may be None for a plain fill. The strip is as wide as
+        size and at least as tall, and is reused until the size, image or
+        colors change.
+        """
+        key = (size, background_img, fill, overlay)
+        if key != self._key:
+            width, height = size
+            if background_img is not None:
+                tile_height = background_img.get_height()
+                height = -(-height // tile_height) * tile_height
+            surface = pygame.Surface((width, height))
+            surface.fill(fill)
+            if background_img is not None:
+                tile(surface, background_img)
+            dark = pygame.Surface((width, height), pygame.SRCALPHA)
+            dark.fill(overlay)
+            surface.blit(dark, (0, 0))
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            self._backdrop = surface
+            self._key = key
+        return self._backdrop
+
+    def overlay(self, size, color):
+        """Return a translucent surface of size filled with color, built once"""
+        key = (size, color)
+        surface = self._overlays.get(key)
+        if surface is None:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            surface.fill(color)
+            self._overlays[key] = surface
+        return surface
+
+    def clear(self):
+        """Drop everything, e.g. after the display or assets were replaced"""
+        self._key = None
+        self._backdrop = None
+        self._overlays.clear()
@@ -0,0 +1,188 @@
+"""Chunked procedural river generation.
+
+The river is cut into chunks of CHUNK_TICKS ticks of scrolling. Each chunk
+is generated on its own from the level seed and its index, so any chunk
+can be built at any time, in any order, on any thread, and always comes out
+the same. A chunk holds rows of stones, lines of coins and the odd magnet,
+denser the further down the river it is.
+
+Every row leaves a gap on a lane the boat can follow. Rows are spaced so
+that only one passes the boat at a time. Between rows the lane moves no
+further than the boat can steer. The lane starts and ends each chunk where
+the boat starts, so chunks still need nothing from their neighbours.
+
+LevelGenerator keeps only the chunk being played and the next few, so an
+endless run uses constant memory. With preload=True the upcoming chunks are
+generated on a background thread.
+"""
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from .constants import (
+    WINDOW_WIDTH, BOAT_WIDTH, BOAT_HEIGHT, STONE_WIDTH, STONE_HEIGHT, COIN_SIZE, MAGNET_SIZE,
+    SCROLL_SPEED, PLAYER_SPEED,
+)
+
+# Kinds of spawn in a chunk
+STONE = 0
+COIN = 1
+MAGNET = 2
+
+# Ticks of river per chunk, one screen height at the default scroll speed
+CHUNK_TICKS = 200
+# Chunks until the difficulty stops rising, about 100 seconds of play
+RAMP_CHUNKS = 30
+
+# Most ticks a stone row spends alongside the boat
+HIT_TICKS = -(-(BOAT_HEIGHT + STONE_HEIGHT) // SCROLL_SPEED)
+# Stone rows per chunk at the start and at full difficulty, as many as fit
+# without two rows passing the boat at once
+MIN_ROWS, MAX_ROWS = 2, CHUNK_TICKS // HIT_TICKS
+# Boat x where every chunk's lane starts and ends, where the boat starts
+LANE_X = WINDOW_WIDTH // 2 - BOAT_WIDTH // 2
+# Range of x the boat can reach in whole steps from LANE_X
+LANE_MIN = LANE_X % PLAYER_SPEED
+LANE_MAX = WINDOW_WIDTH - BOAT_WIDTH - (WINDOW_WIDTH - BOAT_WIDTH - LANE_X) % PLAYER_SPEED
+# Chance that a row is a pair of stones instead of one
+MIN_PAIR_CHANCE, MAX_PAIR_CHANCE = 0.05, 0.5
+# Width of the gap between the stones of a pair
+MIN_GAP = BOAT_WIDTH + 50
+MAX_GAP = BOAT_WIDTH + 150
+
+COIN_LINES = 2
+COIN_LINE_LENGTH = 5
+# Ticks between the coins of a line, so they sit just apart
+COIN_SPACING = -(-(COIN_SIZE + 6) // SCROLL_SPEED)
+MAGNET_CHANCE = 0.25
+
+
+def difficulty(index):
+    """0.0 for the first chunk, rising to 1.0 at RAMP_CHUNKS"""
+    return min(1.0, index / RAMP_CHUNKS)
+
+
+def lerp(low, high, amount):
+    return low + (high - low) * amount
+
+
+class Chunk:
+    """The spawns of one stretch of river, keyed by tick within the chunk"""
+    __slots__ = ('index', 'spawns')
+
+    def __init__(self, index, spawns):
+        self.index = index
+        # offset -> list of (kind, x)
+        self.spawns = spawns
+
+
+def generate_chunk(seed, index):
+    """Build chunk index of the river for seed"""
+    rng = random.Random((seed << 32) | index)
+    level = difficulty(index)
+    spawns = {}
+
+    def add(offset, kind, x):
+        spawns.setdefault(offset, []).append((kind, x))
+
+    # Stone rows, one per equal slot of the chunk, each passing the boat
+    # within its slot
+    rows = round(lerp(MIN_ROWS, MAX_ROWS, level))
+    pair_chance = lerp(MIN_PAIR_CHANCE, MAX_PAIR_CHANCE, level)
+    row_ticks = CHUNK_TICKS / rows
+    offsets = [int(row * row_ticks + rng.uniform(0, row_ticks - HIT_TICKS))
+               for row in range(rows)]
+
+    # The boat steers only while no row is alongside it, so the lane moves
+    # at most that many steps between rows and keeps enough in hand to get
+    # back to LANE_X by the end of the chunk
+    lane = LANE_X
+    steer_from = 0
+    steer_left = CHUNK_TICKS - rows * HIT_TICKS
+    for offset in offsets:
+        steer = offset - steer_from
+        steer_left -= steer
+        low = max(lane - steer * PLAYER_SPEED, LANE_X - steer_left * PLAYER_SPEED, LANE_MIN)
+        high = min(lane + steer * PLAYER_SPEED, LANE_X + steer_left * PLAYER_SPEED, LANE_MAX)
+        lane = rng.randrange(low, high + 1, PLAYER_SPEED)
+        steer_from = offset + HIT_TICKS
+
+        lefts = ()
+        if rng.random() < pair_chance:
+            gap = rng.randint(MIN_GAP, MAX_GAP)
+            lefts = [left for left in range(WINDOW_WIDTH - 2 * STONE_WIDTH - gap + 1)
+                     if _clear(lane, left) and _clear(lane, left + STONE_WIDTH + gap)]
+        if lefts:
+            left = rng.choice(lefts)
+            add(offset, STONE, left)
+            add(offset, STONE, left + STONE_WIDTH + gap)
+        else:
+            add(offset, STONE, rng.choice([x for x in range(WINDOW_WIDTH - STONE_WIDTH + 1)
+                                           if _clear(lane, x)]))
+
+    # Lines of coins, straight or drifting sideways
+    for _ in range(COIN_LINES):
+        start = rng.randint(0, CHUNK_TICKS - COIN_LINE_LENGTH * COIN_SPACING)
+        x = rng.randint(0, WINDOW_WIDTH - COIN_SIZE)
+        drift = rng.choice((-COIN_SIZE, 0, 0, COIN_SIZE))
+        for i in range(COIN_LINE_LENGTH):
+            coin_x = min(max(x + drift * i, 0), WINDOW_WIDTH - COIN_SIZE)
+            add(start + i * COIN_SPACING, COIN, coin_x)
+
+    if rng.random() < MAGNET_CHANCE:
+        add(rng.randrange(CHUNK_TICKS), MAGNET, rng.randint(0, WINDOW_WIDTH - MAGNET_SIZE))
+
+    return Chunk(index, spawns)
+
+
+def _clear(lane, x):
+    """Whether a boat at lane misses a stone at x"""
+    return lane >= x + STONE_WIDTH or lane + BOAT_WIDTH <= x
+
+
+class LevelGenerator:
+    """Streams the chunks of one river, keeping just the current ones.
+
+    lookahead is how many chunks past the current one are kept ready.
+    """
+
+    def __init__(self, seed, lookahead=1, preload=False):
+        self.seed = seed
+        self.lookahead = lookahead
+        self._chunks = {}
+        self._current = None
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix='level') if preload else None
+
+    def __len__(self):
+        """Chunks held in memory, generated or being generated"""
+        return len(self._chunks)
+
+    def spawns(self, tick):
+        """The (kind, x) spawns for tick, an empty tuple if there are none"""
+        index, offset = divmod(tick, CHUNK_TICKS)
+        chunk = self._current
+        if chunk is None or chunk.index != index:
+            chunk = self._advance(index)
+        return chunk.spawns.get(offset, ())
+
+    def _advance(self, index):
+        chunks = self._chunks
+        # Passed chunks are never needed again
+        for old in [old for old in chunks if old < index]:
+            del chunks[old]
+        for ahead in range(index, index + self.lookahead + 1):
+            if ahead not in chunks:
+                if self._executor is not None and ahead != index:
+                    chunks[ahead] = self._executor.submit(generate_chunk, self.seed, ahead)
+                else:
+                    chunks[ahead] = generate_chunk(self.seed, ahead)
+        chunk = chunks[index]
+        if not isinstance(chunk, Chunk):
+            # Still a future from the background thread
+            chunk = chunks[index] = chunk.result()
+        self._current = chunk
+        return chunk
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,98 @@
+"""Several boats on one river.
+
+SharedWorld is a World with a Player per boat instead of a single boat. The
+river, its RNG and its entities are shared; health, score and the magnet
+belong to each player. A stone, coin or magnet touched by several boats in
+the same tick goes to the player with the lowest id. Like World it is
+headless and deterministic given the seed and every player's inputs.
+"""
+from .constants import WINDOW_WIDTH, BOAT_WIDTH
+from .world import World, Boat, INPUT_LEFT, INPUT_RIGHT
+
+# Boats start spread over this many lanes
+START_LANES = 4
+
+
+class Player:
+    """One boat on a shared river and the state that is its own"""
+    __slots__ = ('id', 'boat', 'inputs', 'score', 'magnet_end_time', 'alive')
+
+    def __init__(self, player_id):
+        self.id = player_id
+        self.boat = Boat()
+        lane = player_id % START_LANES
+        self.boat.x = (WINDOW_WIDTH - BOAT_WIDTH) * (2 * lane + 1) // (2 * START_LANES)
+        self.boat.rect.x = self.boat.x
+        # Held INPUT_* bits, applied every tick until changed
+        self.inputs = 0
+        self.score = 0
+        # Last tick of the magnet, 0 when it is off
+        self.magnet_end_time = 0
+        self.alive = True
+
+    def magnet_active(self):
+        return self.magnet_end_time != 0
+
+
+class SharedWorld(World):
+    """A World stepped for every player in self.players at once.
+
+    world.boat is not used; each Player has its own.
+    """
+
+    def __init__(self, seed=None, **options):
+        super().__init__(seed, **options)
+        # id -> Player, stepped in id order
+        self.players = {}
+        self._alive = []
+
+    def add_player(self, player_id):
+        player = self.players[player_id] = Player(player_id)
+        self._update_alive()
+        return player
+
+    def remove_player(self, player_id):
+        self.players.pop(player_id, None)
+        self._update_alive()
+
+    def _update_alive(self):
+        self._alive = sorted((player for player in self.players.values() if player.alive),
+                             key=lambda player: player.id)
+        # Over once everyone left is dead, whether by a crash or a departure
+        self.game_over = bool(self.players) and not self._alive
+
+    def step(self, inputs=None):
+        """Advance one tick, moving each boat by its player's held inputs"""
+        if self.game_over:
+            return
+        self.ticks += 1
+        tick = self.ticks
+        players = self._alive
+
+        magnet_players = []
+        for player in players:
+            boat = player.boat
+            if player.inputs & INPUT_LEFT:
+                boat.move('left')
+            if player.inputs & INPUT_RIGHT:
+                boat.move('right')
+            if player.magnet_end_time:
+                if tick > player.magnet_end_time:
+                    player.magnet_end_time = 0
+                else:
+                    magnet_players.append(player)
+
+        if self.magnet_active and not magnet_players:
+            self._magnet_ended()
+        self.magnet_active = bool(magnet_players)
+
+        self._spawn()
+        self._update_entities(magnet_players, players)
+        self._collide(players)
+
+        if any(not player.alive for player in players):
+            self._update_alive()
+
+    def _crashed(self, player):
+        if player.boat.health <= 0:
+            player.alive = False
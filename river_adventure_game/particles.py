@@ -0,0 +1,87 @@
+"""Falling snow particles.
+
+Snowfall keeps every flake's position, speed and size in parallel arrays,
+moves them all in one vectorized update and draws them with a single
+blits() call of pre-rendered dot stamps, so adding flakes costs little
+interpreted Python. It uses NumPy when it is installed and falls back to
+plain lists otherwise.
+"""
+import random
+
+import pygame
+
+from .constants import WINDOW_WIDTH, WINDOW_HEIGHT, WHITE, BLACK
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MIN_SPEED, MAX_SPEED = 0.5, 2
+MIN_SIZE, MAX_SIZE = 1, 3
+
+
+def make_stamp(radius, color=WHITE):
+    """A color-keyed square with a filled circle of radius in the middle"""
+    stamp = pygame.Surface((radius * 2, radius * 2))
+    stamp.fill(BLACK)
+    stamp.set_colorkey(BLACK, pygame.RLEACCEL)
+    pygame.draw.circle(stamp, color, (radius, radius), radius)
+    return stamp
+
+
+class Snowfall:
+    def __init__(self, count, width=WINDOW_WIDTH, height=WINDOW_HEIGHT, seed=None):
+        self.count = count
+        self.width = width
+        self.height = height
+        self.stamps = [None] + [make_stamp(size) for size in range(MIN_SIZE, MAX_SIZE + 1)]
+        if np is not None:
+            rng = self.rng = np.random.default_rng(seed)
+            self.x = rng.integers(0, width, count, endpoint=True).astype(float)
+            self.y = rng.integers(0, height, count, endpoint=True).astype(float)
+            self.speed = rng.uniform(MIN_SPEED, MAX_SPEED, count)
+            self.size = rng.integers(MIN_SIZE, MAX_SIZE, count, endpoint=True)
+        else:
+            rng = self.rng = random.Random(seed)
+            self.x = [float(rng.randint(0, width)) for _ in range(count)]
+            self.y = [float(rng.randint(0, height)) for _ in range(count)]
+            self.speed = [rng.uniform(MIN_SPEED, MAX_SPEED) for _ in range(count)]
+            self.size = [rng.randint(MIN_SIZE, MAX_SIZE) for _ in range(count)]
+
+    def __len__(self):
+        return self.count
+
+    def update(self):
+        """Move every flake down by its speed, wrapping fallen ones to the top"""
+        if np is not None:
+            self.y += self.speed
+            fallen = self.y > self.height
+            count = np.count_nonzero(fallen)
+            if count:
+                self.y[fallen] = -5
+                self.x[fallen] = self.rng.integers(0, self.width, count, endpoint=True)
+            return
+        x, y, speed = self.x, self.y, self.speed
+        for i in range(self.count):
+            y[i] += speed[i]
+            if y[i] > self.height:
+                y[i] = -5
+                x[i] = self.rng.randint(0, self.width)
+
+    def draw(self, window):
+        """Blit every flake and return the list of rects drawn"""
+        return window.blits(self.sprites())
+
+    def sprites(self):
+        """(stamp, top left corner) of every flake"""
+        if np is not None:
+            # Top left corner of each stamp, truncated like int() would
+            left = (self.x.astype(int) - self.size).tolist()
+            top = (self.y.astype(int) - self.size).tolist()
+            sizes = self.size.tolist()
+        else:
+            left = [int(x) - size for x, size in zip(self.x, self.size)]
+            top = [int(y) - size for y, size in zip(self.y, self.size)]
+            sizes = self.size
+        return zip(map(self.stamps.__getitem__, sizes), zip(left, top))
@@ -0,0 +1,240 @@
+"""Reproducible performance suite.
+
+Times the simulation and rendering hot paths with fixed seeds and scripted
+inputs, on SDL's dummy video driver unless another one is set, so runs on
+the same machine are comparable:
+
+    python -m river_adventure_game.perf --out results.json
+    python -m river_adventure_game.perf --save-baseline baseline.json
+    python -m river_adventure_game.perf --baseline baseline.json
+
+Each measurement is the best of several repeats. With --baseline, any
+result more than --tolerance worse than the stored one is reported as a
+regression and the exit status is 1.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+import pygame
+
+from .constants import WINDOW_WIDTH, WINDOW_HEIGHT
+from .game import draw_start_screen, draw_game_over
+from .masks import SpriteMasks
+from .particles import Snowfall
+from .render import Renderer
+from .world import World, INPUT_LEFT, INPUT_RIGHT
+
+SEED = 1234
+
+# (name, stone, coin and magnet spawn rates), from the default game up
+DENSITIES = (
+    ('default', 60, 80, 300),
+    ('busy', 20, 25, 100),
+    ('dense', 8, 10, 40),
+    ('extreme', 3, 4, 15),
+)
+
+RESOLUTIONS = ((800, 600), (1280, 720), (1920, 1080))
+
+
+def best_of(repeats, run):
+    """Smallest wall time of repeats calls of run()"""
+    best = float('inf')
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def scripted_inputs(count, seed=SEED):
+    """Inputs that hold a random direction, or nothing, for 5 to 60 ticks"""
+    rng = random.Random(seed)
+    inputs = []
+    while len(inputs) < count:
+        inputs.extend([rng.choice((0, INPUT_LEFT, INPUT_RIGHT))] * rng.randint(5, 60))
+    return inputs[:count]
+
+
+def busy_world(rates, ticks, inputs, masks=None):
+    """A World stepped through inputs with its boat kept alive"""
+    stone_rate, coin_rate, magnet_rate = rates
+    world = World(SEED, stone_spawn_rate=stone_rate, coin_spawn_rate=coin_rate,
+                  magnet_spawn_rate=magnet_rate, masks=masks)
+    step = world.step
+    boat = world.boat
+    for tick in range(ticks):
+        step(inputs[tick])
+        boat.health = 3
+    return world
+
+
+def result(value, unit, better):
+    return {'value': value, 'unit': unit, 'better': better}
+
+
+def bench_simulation(ticks, repeats):
+    inputs = scripted_inputs(ticks)
+    results = {}
+    for name, *rates in DENSITIES:
+        seconds = best_of(repeats, lambda: busy_world(rates, ticks, inputs))
+        results[f'sim.{name}'] = result(ticks / seconds, 'ticks/s', 'higher')
+    # The busy river again with pixel-precise collision
+    masks = SpriteMasks()
+    rates = DENSITIES[1][1:]
+    seconds = best_of(repeats, lambda: busy_world(rates, ticks, inputs, masks))
+    results['sim.busy.masks'] = result(ticks / seconds, 'ticks/s', 'higher')
+    return results
+
+
+def bench_render(frames, repeats):
+    world = busy_world(DENSITIES[1][1:], 600, scripted_inputs(600))
+    results = {}
+    for width, height in RESOLUTIONS:
+        size = f'{width}x{height}'
+        window = pygame.display.set_mode((width, height))
+        renderer = Renderer(window)
+        particles = Snowfall(30, seed=SEED)
+        random.seed(SEED)
+
+        def backdrop():
+            for frame in range(frames):
+                renderer.draw_backdrop(frame)
+
+        def overlay():
+            for _ in range(frames):
+                renderer.draw_overlay()
+
+        def hud():
+            draw = renderer.score_hud.draw
+            for frame in range(frames):
+                # A new score every 8 frames, like steady coin pickups
+                draw(window, (10, 10), 'Score: ', frame // 8 * 10)
+
+        def full_frames():
+            renderer.dirty_rects = False
+            renderer.reset_dirty_rects()
+            for _ in range(frames):
+                renderer.draw_world(world, particles)
+
+        def dirty_frames():
+            renderer.dirty_rects = True
+            renderer.reset_dirty_rects()
+            for _ in range(frames):
+                renderer.draw_world(world, particles)
+
+        for name, run in (('backdrop', backdrop), ('overlay', overlay), ('hud', hud),
+                          ('frame', full_frames), ('dirty_frame', dirty_frames)):
+            seconds = best_of(repeats, run)
+            results[f'render.{name}.{size}'] = result(seconds * 1000 / frames, 'ms/frame', 'lower')
+    return results
+
+
+def bench_menus(frames, repeats):
+    renderer = Renderer(pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT)))
+    particles = Snowfall(20, seed=SEED)
+    random.seed(SEED)
+
+    def start_screen():
+        for frame in range(frames):
+            particles.update()
+            draw_start_screen(renderer, frame / 60, particles)
+
+    def game_over():
+        for frame in range(frames):
+            draw_game_over(renderer, frame / 60, 1230)
+
+    return {
+        'menu.start_screen': result(best_of(repeats, start_screen) * 1000 / frames, 'ms/frame', 'lower'),
+        'menu.game_over': result(best_of(repeats, game_over) * 1000 / frames, 'ms/frame', 'lower'),
+    }
+
+
+def run(ticks=3000, frames=300, repeats=5):
+    """Run every benchmark and return the results document"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    try:
+        results = bench_simulation(ticks, repeats)
+        results.update(bench_render(frames, repeats))
+        results.update(bench_menus(frames, repeats))
+    finally:
+        pygame.quit()
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'video_driver': os.environ['SDL_VIDEODRIVER'],
+            'seed': SEED,
+            'ticks': ticks,
+            'frames': frames,
+            'repeats': repeats,
+        },
+        'results': results,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Yield (name, baseline value, value, relative change, regressed).
+
+    The change is positive when the result got better. Benchmarks missing
+    from either side are skipped.
+    """
+    for name, current in results.items():
+        stored = baseline.get(name)
+        if stored is None or not stored['value']:
+            continue
+        change = current['value'] / stored['value'] - 1
+        if current['better'] == 'lower':
+            change = stored['value'] / current['value'] - 1
+        yield name, stored['value'], current['value'], change, change < -tolerance
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m river_adventure_game.perf')
+    parser.add_argument('--ticks', type=int, default=3000, help='simulation ticks per run')
+    parser.add_argument('--frames', type=int, default=300, help='frames per render run')
+    parser.add_argument('--repeats', type=int, default=5, help='runs per benchmark, the best is kept')
+    parser.add_argument('--out', metavar='PATH', help='write the results as JSON')
+    parser.add_argument('--save-baseline', metavar='PATH', help='store the results as a baseline')
+    parser.add_argument('--baseline', metavar='PATH', help='compare against a stored baseline')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='fraction a result may be worse than the baseline (default 0.15)')
+    args = parser.parse_args(argv)
+
+    document = run(args.ticks, args.frames, max(1, args.repeats))
+    results = document['results']
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(document, f, indent=2)
+
+    if not args.baseline:
+        for name, entry in results.items():
+            print(f"{name:<28} {entry['value']:>12.3f} {entry['unit']}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    regressions = 0
+    print(f"{'benchmark':<28} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, stored, value, change, regressed in compare(results, baseline, args.tolerance):
+        regressions += regressed
+        print(f'{name:<28} {stored:>12.3f} {value:>12.3f} {change:>+7.1%}'
+              + ('  REGRESSION' if regressed else ''))
+    if regressions:
+        print(f'{regressions} regression(s) beyond {args.tolerance:.0%}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Scripted players for headless runs.
+
+A policy is a callable taking a World and returning the INPUT_* bits for the
+next tick. make_policy builds one by name.
+"""
+import random
+
+from .constants import WINDOW_WIDTH
+from .world import INPUT_LEFT, INPUT_RIGHT
+
+# How far above the boat a stone counts as a threat, in pixels
+LOOKAHEAD = 160
+# Extra room kept between the boat and a stone it is dodging
+MARGIN = 6
+
+
+def idle_policy(world):
+    return 0
+
+
+class RandomPolicy:
+    """Holds a random direction for a random number of ticks"""
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        self.inputs = 0
+        self.hold = 0
+
+    def __call__(self, world):
+        if self.hold <= 0:
+            self.inputs = self.rng.choice((0, INPUT_LEFT, INPUT_RIGHT))
+            self.hold = self.rng.randint(5, 40)
+        self.hold -= 1
+        return self.inputs
+
+
+def _steer(boat, target_x):
+    if target_x < boat.x - boat.speed / 2:
+        return INPUT_LEFT
+    if target_x > boat.x + boat.speed / 2:
+        return INPUT_RIGHT
+    return 0
+
+
+def greedy_policy(world):
+    """Dodge the closest stone in the boat's lane, otherwise chase coins"""
+    boat = world.boat
+    left = boat.x - MARGIN
+    right = boat.x + boat.width + MARGIN
+
+    threat = None
+    for stone in world.stones:
+        if (stone.y + stone.height > boat.y - LOOKAHEAD and stone.y < boat.y + boat.height
+                and stone.x < right and stone.x + stone.width > left):
+            if threat is None or stone.y > threat.y:
+                threat = stone
+    if threat is not None:
+        # Slip past whichever end of the stone is closer and still on screen
+        targets = [x for x in (threat.x - boat.width - MARGIN, threat.x + threat.width + MARGIN)
+                   if 0 <= x <= WINDOW_WIDTH - boat.width]
+        if targets:
+            return _steer(boat, min(targets, key=lambda x: abs(x - boat.x)))
+        return 0
+
+    best = None
+    for item in world.magnets + world.coins:
+        if item.y + item.height > boat.y + boat.height:
+            continue
+        distance = abs(item.x + item.width / 2 - (boat.x + boat.width / 2)) + (boat.y - item.y)
+        if best is None or distance < best[0]:
+            best = (distance, item)
+    if best is None:
+        return 0
+    item = best[1]
+    return _steer(boat, item.x + item.width / 2 - boat.width / 2)
+
+
+POLICIES = ('idle', 'random', 'greedy')
+
+
+def make_policy(name, seed=None):
+    """Return a fresh policy callable for one game"""
+    if name == 'idle':
+        return idle_policy
+    if name == 'random':
+        return RandomPolicy(seed)
+    if name == 'greedy':
+        return greedy_policy
+    raise ValueError(f'unknown policy {name!r}, expected one of {", ".join(POLICIES)}')
@@ -0,0 +1,47 @@
+"""Free-list pools for recycling game entities"""
+
+
+class Pool:
+    """Keeps the live instances of one entity class in a plain list.
+
+    Released entities go on a free list and are handed out again by spawn(),
+    so steady play allocates no new entities. Removal swaps the last live
+    entity into the freed slot, which makes it O(1) but does not keep the
+    live list in spawn order; each entity's serial records that order.
+
+    Entities need a reset(*args) method and slot and serial attributes.
+    """
+    __slots__ = ('factory', 'active', 'free', 'spawned')
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.active = []
+        self.free = []
+        self.spawned = 0
+
+    def __len__(self):
+        return len(self.active)
+
+    def spawn(self, *args):
+        if self.free:
+            entity = self.free.pop()
+            entity.reset(*args)
+        else:
+            entity = self.factory(*args)
+        entity.slot = len(self.active)
+        entity.serial = self.spawned
+        self.spawned += 1
+        self.active.append(entity)
+        return entity
+
+    def release(self, entity):
+        active = self.active
+        last = active.pop()
+        if last is not entity:
+            active[entity.slot] = last
+            last.slot = entity.slot
+        self.free.append(entity)
+
+    def clear(self):
+        self.free.extend(self.active)
+        self.active.clear()
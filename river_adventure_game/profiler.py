@@ -0,0 +1,123 @@
+"""Frame-time profiler.
+
+A frame is split into named scopes by calling lap(name) at the end of each
+section: the time since the previous lap is charged to name. Laps are a
+perf_counter() call and a dict update, cheap enough to leave on in every
+frame, so the overlay can be toggled during play without restarting.
+
+Per-frame samples can be written to a CSV or JSON lines file, picked by the
+file extension, for attaching to stutter reports.
+"""
+import csv
+import json
+import time
+from collections import deque
+
+# Scopes in the order a frame runs them
+SCOPES = (
+    'events',     # event queue and keyboard state
+    'spawn',      # boat movement, magnet expiry and spawning
+    'update',     # moving stones, coins, magnets and particles
+    'collision',  # grid scroll, collision query and removal
+    'background', # backdrop blits
+    'blits',      # particle and entity blits
+    'hud',        # HUD text and overlays
+    'display',    # presenting the frame
+    'wait',       # clock.tick
+)
+
+# narrow is the number of pixel mask tests run during the frame
+COUNTS = ('stones', 'coins', 'magnets', 'ticks', 'narrow')
+
+
+def percentile(sorted_values, fraction):
+    """The value fraction of the way up sorted_values, 0 if it is empty"""
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+class FrameProfiler:
+    """Collects per-scope timings for each frame and keeps a rolling history"""
+
+    def __init__(self, history=600):
+        self.frames = deque(maxlen=history)
+        self.frame = 0
+        self.current = dict.fromkeys(SCOPES, 0.0)
+        self._start = self._mark = time.perf_counter()
+        self._dump = None
+        self._writer = None
+        self._narrow_tests = 0
+
+    def begin_frame(self):
+        self._start = self._mark = time.perf_counter()
+        current = self.current
+        for scope in current:
+            current[scope] = 0.0
+
+    def lap(self, scope):
+        """Charge the time since the last lap to scope"""
+        now = time.perf_counter()
+        self.current[scope] += now - self._mark
+        self._mark = now
+
+    def end_frame(self, world=None):
+        """Finish the frame, recording entity counts from world if given"""
+        total = time.perf_counter() - self._start
+        counts = {}
+        if world is not None:
+            counts = {'stones': len(world.stones), 'coins': len(world.coins),
+                      'magnets': len(world.magnets), 'ticks': world.ticks}
+            if world.masks is not None:
+                counts['narrow'] = world.masks.tests - self._narrow_tests
+                self._narrow_tests = world.masks.tests
+        sample = (total, dict(self.current), counts)
+        self.frames.append(sample)
+        if self._dump:
+            self._write(self.frame, sample)
+        self.frame += 1
+
+    def stats(self):
+        """Summary of the frames in the history, times in milliseconds"""
+        frames = self.frames
+        if not frames:
+            return {'fps': 0.0, 'p50_ms': 0.0, 'p99_ms': 0.0, 'scopes': {}, 'counts': {}}
+        totals = sorted(frame[0] for frame in frames)
+        mean = sum(totals) / len(totals)
+        scopes = {scope: sum(frame[1][scope] for frame in frames) * 1000 / len(frames)
+                  for scope in SCOPES}
+        return {
+            'fps': 1 / mean if mean > 0 else 0.0,
+            'p50_ms': percentile(totals, 0.5) * 1000,
+            'p99_ms': percentile(totals, 0.99) * 1000,
+            'scopes': scopes,
+            'counts': frames[-1][2],
+        }
+
+    def open_dump(self, path):
+        """Write every following frame to path, CSV unless it ends in .jsonl"""
+        self.close_dump()
+        self._dump = open(path, 'w', newline='')
+        if path.endswith('.jsonl'):
+            self._writer = None
+        else:
+            self._writer = csv.writer(self._dump)
+            self._writer.writerow(('frame', 'frame_ms') + tuple(f'{scope}_ms' for scope in SCOPES) + COUNTS)
+
+    def _write(self, frame, sample):
+        total, scopes, counts = sample
+        if self._writer:
+            self._writer.writerow([frame, f'{total * 1000:.3f}']
+                                  + [f'{scopes[scope] * 1000:.3f}' for scope in SCOPES]
+                                  + [counts.get(name, '') for name in COUNTS])
+        else:
+            record = {'frame': frame, 'frame_ms': round(total * 1000, 3)}
+            record.update((f'{scope}_ms', round(scopes[scope] * 1000, 3)) for scope in SCOPES)
+            record.update(counts)
+            self._dump.write(json.dumps(record) + '\n')
+
+    def close_dump(self):
+        if self._dump:
+            self._dump.close()
+            self._dump = None
+            self._writer = None
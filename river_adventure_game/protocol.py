@@ -0,0 +1,226 @@
+"""Wire format for multiplayer rooms.
+
+Every message is a little-endian uint16 length followed by that many bytes,
+the first of which is the message type. Clients send JOIN once and then
+INPUT whenever their held keys change; the server sends WELCOME on joining
+and whenever the room's river restarts, then a SNAPSHOT every few ticks.
+
+Snapshots are deltas against what the room has already sent. Positions are
+quantized to whole pixels, and both ends assume everything drifts down at
+SCROLL_SPEED per tick, so an entity is only sent when it appears or strays
+from that prediction (a coin pulled by a magnet). A snapshot holds, in
+order:
+
+    header      type, tick, flags (FLAG_FULL: drop everything known first)
+    boats       count, then id, x, health, BOAT_* flags, score per changed boat
+    gone        count, then the id of each player that left
+    removed     count, then the id of each entity that is gone
+    entities    count, then id, x, y per new or corrected entity
+
+Entity ids carry the kind (level.STONE, COIN or MAGNET) in their low two
+bits.
+"""
+import struct
+
+from .constants import SCROLL_SPEED
+from .level import STONE, COIN, MAGNET
+from .world import Stone, Coin, Magnet
+
+# Message types
+MSG_JOIN = 1      # client: room name, UTF-8
+MSG_INPUT = 2     # client: held INPUT_* bits
+MSG_WELCOME = 3   # server: player id, seed, tick
+MSG_SNAPSHOT = 4  # server: see above
+
+FRAME = struct.Struct('<H')
+INPUT = struct.Struct('<BB')
+WELCOME = struct.Struct('<BBII')
+SNAPSHOT = struct.Struct('<BIB')
+COUNT8 = struct.Struct('<B')
+COUNT16 = struct.Struct('<H')
+BOAT = struct.Struct('<BhbBI')
+PLAYER = struct.Struct('<B')
+ENTITY_ID = struct.Struct('<I')
+ENTITY = struct.Struct('<Ihh')
+
+FLAG_FULL = 1
+
+# Boat flags
+BOAT_ALIVE = 1
+BOAT_MAGNET = 2
+BOAT_CRASH = 4
+
+# Largest message a client may send
+MAX_CLIENT_MESSAGE = 64
+
+KINDS = {Stone: STONE, Coin: COIN, Magnet: MAGNET}
+
+
+def frame(payload):
+    return FRAME.pack(len(payload)) + payload
+
+
+def entity_id(entity):
+    return entity.serial << 2 | KINDS[type(entity)]
+
+
+def boat_record(world, player):
+    boat = player.boat
+    flags = 0
+    if player.alive:
+        flags |= BOAT_ALIVE
+    if player.magnet_end_time:
+        flags |= BOAT_MAGNET
+    if world.ticks < boat.crash_effect_time:
+        flags |= BOAT_CRASH
+    return (int(boat.x), max(boat.health, 0), flags, player.score)
+
+
+class Baseline:
+    """What the receivers of a stream of snapshots know about a room.
+
+    entities maps id -> (x, y, tick) as last sent; the entity is assumed to
+    have moved down SCROLL_SPEED per tick since. boats maps player id ->
+    boat record as last sent.
+    """
+
+    def __init__(self):
+        self.entities = {}
+        self.boats = {}
+
+    def clear(self):
+        self.entities.clear()
+        self.boats.clear()
+
+
+def encode_delta(world, baseline, budget=None):
+    """Snapshot of world against baseline, which is updated to match.
+
+    Boats, players leaving and removals are always included. New and
+    corrected entities are added until the snapshot reaches budget bytes;
+    the rest stay in the baseline's difference and go out next time.
+    """
+    tick = world.ticks
+    parts = [SNAPSHOT.pack(MSG_SNAPSHOT, tick, 0)]
+
+    boats = baseline.boats
+    changed = []
+    for player_id, player in world.players.items():
+        record = boat_record(world, player)
+        if boats.get(player_id) != record:
+            boats[player_id] = record
+            changed.append(BOAT.pack(player_id, *record))
+    gone = [player_id for player_id in boats if player_id not in world.players]
+    for player_id in gone:
+        del boats[player_id]
+    parts.append(COUNT8.pack(len(changed)))
+    parts.extend(changed)
+    parts.append(COUNT8.pack(len(gone)))
+    parts.extend(PLAYER.pack(player_id) for player_id in gone)
+
+    known = baseline.entities
+    live = set()
+    new = []
+    corrected = []
+    for entities in (world.stones, world.coins, world.magnets):
+        for entity in entities:
+            key = entity_id(entity)
+            live.add(key)
+            x = int(entity.x)
+            y = int(entity.y)
+            sent = known.get(key)
+            if sent is None:
+                new.append((key, x, y))
+            elif sent[0] != x or sent[1] + (tick - sent[2]) * SCROLL_SPEED != y:
+                corrected.append((key, x, y))
+
+    removed = [key for key in known if key not in live]
+    for key in removed:
+        del known[key]
+    parts.append(COUNT16.pack(len(removed)))
+    parts.extend(ENTITY_ID.pack(key) for key in removed)
+
+    size = sum(map(len, parts)) + COUNT16.size
+    records = []
+    # New entities go first, a correction left for later is only a few
+    # pixels off while a missing stone is invisible
+    for key, x, y in new + corrected:
+        if budget is not None and size + ENTITY.size > budget:
+            break
+        records.append(ENTITY.pack(key, x, y))
+        known[key] = (x, y, tick)
+        size += ENTITY.size
+    parts.append(COUNT16.pack(len(records)))
+    parts.extend(records)
+    return frame(b''.join(parts))
+
+
+def encode_full(baseline, tick):
+    """Snapshot that brings a new receiver up to baseline as of tick"""
+    parts = [SNAPSHOT.pack(MSG_SNAPSHOT, tick, FLAG_FULL),
+             COUNT8.pack(len(baseline.boats))]
+    parts.extend(BOAT.pack(player_id, *record) for player_id, record in baseline.boats.items())
+    parts.append(COUNT8.pack(0))
+    parts.append(COUNT16.pack(0))
+    parts.append(COUNT16.pack(len(baseline.entities)))
+    parts.extend(ENTITY.pack(key, x, y + (tick - sent_tick) * SCROLL_SPEED)
+                 for key, (x, y, sent_tick) in baseline.entities.items())
+    return frame(b''.join(parts))
+
+
+class Mirror:
+    """A client's copy of a room, rebuilt from WELCOME and SNAPSHOT messages"""
+
+    def __init__(self):
+        self.player_id = None
+        self.seed = None
+        self.tick = 0
+        self.baseline = Baseline()
+
+    def apply(self, payload):
+        """Apply one message (without its length prefix)"""
+        kind = payload[0]
+        if kind == MSG_WELCOME:
+            _, self.player_id, self.seed, self.tick = WELCOME.unpack(payload)
+            self.baseline.clear()
+        elif kind == MSG_SNAPSHOT:
+            self._apply_snapshot(payload)
+        else:
+            raise ValueError(f'unexpected message type {kind}')
+
+    def _apply_snapshot(self, payload):
+        _, tick, flags = SNAPSHOT.unpack_from(payload)
+        offset = SNAPSHOT.size
+        baseline = self.baseline
+        if flags & FLAG_FULL:
+            baseline.clear()
+        self.tick = tick
+
+        count, = COUNT8.unpack_from(payload, offset)
+        offset += COUNT8.size
+        for _ in range(count):
+            player_id, *record = BOAT.unpack_from(payload, offset)
+            baseline.boats[player_id] = tuple(record)
+            offset += BOAT.size
+        count, = COUNT8.unpack_from(payload, offset)
+        offset += COUNT8.size
+        for _ in range(count):
+            baseline.boats.pop(payload[offset], None)
+            offset += PLAYER.size
+
+        entities = baseline.entities
+        count, = COUNT16.unpack_from(payload, offset)
+        offset += COUNT16.size
+        for key, in ENTITY_ID.iter_unpack(payload[offset:offset + count * ENTITY_ID.size]):
+            entities.pop(key, None)
+        offset += count * ENTITY_ID.size
+        count, = COUNT16.unpack_from(payload, offset)
+        offset += COUNT16.size
+        for key, x, y in ENTITY.iter_unpack(payload[offset:offset + count * ENTITY.size]):
+            entities[key] = (x, y, tick)
+
+    def entities(self, tick=None):
+        """(kind, x, y) of every known entity, predicted forward to tick"""
+        tick = self.tick if tick is None else tick
+        return [(key & 3, x, y + (tick - sent_tick) * SCROLL_SPEED)
+                for key, (x, y, sent_tick) in self.baseline.entities.items()]
@@ -0,0 +1,261 @@
+"""Drawing of World state onto a pygame surface"""
+import random
+
+import pygame
+
+from .assets import AssetManager
+from .constants import WHITE, BLUE, RED, GREEN, SCROLL_SPEED, SPRITES
+from .layers import LayerCache, NIGHT_OVERLAY
+from .sprites import SpriteCache
+from .text import TextCache, DigitAtlas
+
+# Red flash when the boat takes damage
+CRASH_OVERLAY = (255, 0, 0, 100)
+# Background of the profiler overlay
+PROFILE_PANEL = (0, 0, 0, 160)
+# Frames between redraws of the profiler overlay text
+PROFILE_REFRESH = 30
+BACKGROUND = 'background.png'
+
+
+class Renderer:
+    """Owns the images and fonts and draws a World onto a surface.
+
+    Needs a display mode to be set first so images can be converted. Images
+    come from an AssetManager on first use; the ones the start screen needs
+    are preloaded first.
+    """
+
+    def __init__(self, window, dirty_rects=False, assets=None):
+        self.window = window
+        # In dirty-rect mode the background does not scroll and draw_world
+        # returns just the regions that changed
+        self.dirty_rects = dirty_rects
+        self._drawn = None
+        # Optional FrameProfiler, and whether its overlay is shown
+        self.profiler = None
+        self.show_profiler = False
+        self._profile_surface = None
+        self._profile_frame = -PROFILE_REFRESH
+
+        # Start loading images in the background, start screen ones first
+        self.assets = assets or AssetManager()
+        self.assets.preload([(BACKGROUND, None, 0)]
+                            + [(filename, size, rotate) for _, filename, size, rotate, _ in SPRITES])
+        self._images = {}
+
+        # Pre-composited background and overlays, and scaled sprite variants
+        self.layers = LayerCache()
+        self.sprites = SpriteCache()
+
+        # Font setup. SysFont(None, ...) is the default font, but looking it
+        # up through SysFont scans every installed font first.
+        self.font = pygame.font.Font(None, 36)
+        self.big_font = pygame.font.Font(None, 72)
+        self.small_font = pygame.font.Font(None, 22)
+        self.text = TextCache()
+
+        # HUD numbers are drawn from pre-rendered digits
+        self.score_hud = DigitAtlas(self.font, WHITE, self.text)
+        self.health_hud = DigitAtlas(self.font, RED, self.text)
+        self.magnet_hud = DigitAtlas(self.font, GREEN, self.text)
+
+    def _sprite(self, attribute, filename, size, rotate, color):
+        image = self._images.get(attribute)
+        if image is None:
+            try:
+                image = self.assets.image(filename, size, rotate)
+            except (pygame.error, FileNotFoundError):
+                # Fallback to colored rectangle if image not found
+                image = pygame.Surface(size)
+                image.fill(color)
+                print(f"Warning: Could not load {filename}, using placeholder")
+            self._images[attribute] = image
+        return image
+
+    @property
+    def boat_img(self):
+        return self._sprite(*SPRITES[0])
+
+    @property
+    def coin_img(self):
+        return self._sprite(*SPRITES[1])
+
+    @property
+    def stone_img(self):
+        return self._sprite(*SPRITES[2])
+
+    @property
+    def magnet_img(self):
+        return self._sprite(*SPRITES[3])
+
+    @property
+    def background_img(self):
+        """The background tile, kept at its original size, or None if missing"""
+        if 'background_img' not in self._images:
+            try:
+                self._images['background_img'] = self.assets.image(BACKGROUND)
+            except (pygame.error, FileNotFoundError):
+                self._images['background_img'] = None
+                print(f"Warning: Could not load {BACKGROUND}, using solid color")
+        return self._images['background_img']
+
+    @property
+    def has_background(self):
+        return self.background_img is not None
+
+    def backdrop(self):
+        """The cached background strip, plain blue water if there is no image"""
+        size = self.window.get_size()
+        if self.has_background:
+            return self.layers.backdrop(size, self.background_img)
+        return self.layers.backdrop(size, None, BLUE)
+
+    def draw_backdrop(self, scroll=0):
+        """Draw the tiled background under the night overlay.
+
+        The river is moved down by scroll pixels, wrapping around. Returns
+        False without drawing if there is no background image, so callers
+        can draw their own water first.
+        """
+        if not self.has_background:
+            return False
+        self._blit_strip(self.backdrop(), scroll)
+        return True
+
+    def _blit_strip(self, strip, scroll):
+        height = strip.get_height()
+        offset = scroll % height
+        self.window.blit(strip, (0, offset))
+        if offset:
+            self.window.blit(strip, (0, offset - height))
+
+    def draw_overlay(self, color=NIGHT_OVERLAY):
+        self.window.blit(self.layers.overlay(self.window.get_size(), color), (0, 0))
+
+    def draw_panel(self, rect, color):
+        """Draw a translucent box, reusing the surface for each size and color"""
+        x, y, width, height = rect
+        return self.window.blit(self.layers.overlay((width, height), color), (x, y))
+
+    def draw_world(self, world, particles=None):
+        """Draw one frame of world state, without flipping the display.
+
+        Returns the rects to pass to pygame.display.update(): None, meaning
+        the whole window, unless the renderer is in dirty-rect mode.
+        """
+        window = self.window
+        blit = window.blit
+        boat = world.boat
+        profiler = self.profiler
+        crash = world.crash_effect_active()
+
+        # Apply screen shake
+        screen_shake = world.screen_shake
+        shake_x = random.randint(-screen_shake, screen_shake) if screen_shake > 0 else 0
+        shake_y = random.randint(-screen_shake, screen_shake) if screen_shake > 0 else 0
+
+        # Draw background and overlay. In dirty-rect mode the river stands
+        # still and only what was drawn over it last frame is painted back.
+        backdrop = self.backdrop()
+        if self._drawn is None:
+            self._blit_strip(backdrop, 0 if self.dirty_rects else world.ticks * SCROLL_SPEED)
+            dirty = None
+        else:
+            dirty = self._drawn
+            for rect in dirty:
+                blit(backdrop, rect, rect)
+        drawn = []
+        if profiler:
+            profiler.lap('background')
+
+        # Draw particles on top of overlay
+        if particles is not None:
+            drawn.extend(particles.draw(window))
+
+        # Draw objects with shake effect
+        drawn.append(blit(self.boat_img, (boat.x + shake_x, boat.y + shake_y)))
+        stone_img = self.stone_img
+        for stone in world.stones:
+            drawn.append(blit(stone_img, (stone.x + shake_x, stone.y + shake_y)))
+        coin_img = self.coin_img
+        for coin in world.coins:
+            drawn.append(blit(coin_img, (coin.x + shake_x, coin.y + shake_y)))
+        magnet_img = self.magnet_img
+        for magnet in world.magnets:
+            drawn.append(blit(magnet_img, (magnet.x + shake_x, magnet.y + shake_y)))
+
+        # Draw crash effect (red flash)
+        if crash:
+            self.draw_overlay(CRASH_OVERLAY)
+
+        if profiler:
+            profiler.lap('blits')
+
+        # Draw score and health
+        drawn.append(self.score_hud.draw(window, (10, 10), 'Score: ', world.score))
+        drawn.append(self.health_hud.draw(window, (10, 50), 'Health: ', boat.health))
+
+        # Draw magnet timer if active
+        if world.magnet_active:
+            drawn.append(self.magnet_hud.draw(window, (10, 90), 'Magnet: ',
+                                              world.magnet_time_left(), 's'))
+
+        if self.show_profiler and profiler:
+            drawn.append(self.draw_profiler())
+        if profiler:
+            profiler.lap('hud')
+
+        if not self.dirty_rects or crash:
+            # The flash covers the whole window, so the next frame starts over
+            self._drawn = None
+            return None
+        self._drawn = drawn
+        if dirty is None:
+            return None
+        dirty.extend(drawn)
+        return dirty
+
+    def draw_profiler(self):
+        """Draw the profiler stats in the top right corner and return the rect"""
+        surface = self.profiler_surface()
+        return self.window.blit(surface, (self.window.get_width() - surface.get_width() - 10, 10))
+
+    def profiler_surface(self):
+        """The profiler stats panel.
+
+        The text is re-rendered only every PROFILE_REFRESH frames, both to
+        keep it readable and to keep the overlay cheap.
+        """
+        profiler = self.profiler
+        if self._profile_surface is None or profiler.frame - self._profile_frame >= PROFILE_REFRESH:
+            stats = profiler.stats()
+            counts = stats['counts']
+            lines = [f"FPS {stats['fps']:.0f}  p50 {stats['p50_ms']:.1f} ms  p99 {stats['p99_ms']:.1f} ms",
+                     f"stones {counts.get('stones', 0)}  coins {counts.get('coins', 0)}  "
+                     f"magnets {counts.get('magnets', 0)}"]
+            font = self.small_font
+            line_height = font.get_linesize()
+            rendered = [(font.render(line, True, WHITE), None) for line in lines]
+            rendered.extend((font.render(scope, True, WHITE), font.render(f'{ms:.2f} ms', True, WHITE))
+                            for scope, ms in stats['scopes'].items())
+            width = max(left.get_width() for left, right in rendered) + 16
+            surface = pygame.Surface((width, line_height * len(rendered) + 12), pygame.SRCALPHA)
+            surface.fill(PROFILE_PANEL)
+            for i, (left, right) in enumerate(rendered):
+                y = 6 + i * line_height
+                surface.blit(left, (8, y))
+                if right:
+                    # Right-align the times in a column
+                    surface.blit(right, (width - 8 - right.get_width(), y))
+            self._profile_surface = surface
+            self._profile_frame = profiler.frame
+        return self._profile_surface
+
+    def present(self, rects=None):
+        """Show the finished frame, rects as returned by draw_world()"""
+        pygame.display.update(rects)
+
+    def reset_dirty_rects(self):
+        """Make the next draw_world() repaint the whole window"""
+        self._drawn = None
@@ -0,0 +1,204 @@
+"""Input recording and headless replay verification.
+
+A replay file holds the world seed, the claimed final score and health,
+whether the river was chunk generated, whether collisions were
+pixel-precise, and the INPUT_* bits of every tick packed four ticks to a
+byte and compressed.
+Because World is deterministic, stepping a fresh World(seed) through the
+recorded inputs reproduces the run exactly, with no display and no frame cap.
+
+Verify submitted runs in bulk with:
+
+    python -m river_adventure_game.replay verify runs/*.rar
+"""
+import argparse
+import struct
+import sys
+import time
+import zlib
+
+from .level import LevelGenerator
+from .masks import SpriteMasks
+from .world import World
+
+MAGIC = b'RAR1'
+VERSION = 2
+# magic, version, seed, tick count, final score, final health, flags
+HEADER = struct.Struct('<4sBIIIbB')
+# Seeds are stored as unsigned 32-bit ints
+MAX_SEED = 2 ** 32 - 1
+# Version 1 files have no flags and always used the random spawner
+HEADER_V1 = struct.Struct('<4sBIIIb')
+
+# Header flags
+FLAG_CHUNKED = 1
+FLAG_PRECISE = 2
+
+
+class ReplayError(Exception):
+    pass
+
+
+def pack_inputs(inputs):
+    """Pack a sequence of 2-bit input values four to a byte"""
+    packed = bytearray((len(inputs) + 3) // 4)
+    for i, value in enumerate(inputs):
+        packed[i >> 2] |= (value & 3) << ((i & 3) * 2)
+    return bytes(packed)
+
+
+def unpack_inputs(data, count):
+    inputs = bytearray(count)
+    for i in range(count):
+        inputs[i] = (data[i >> 2] >> ((i & 3) * 2)) & 3
+    return inputs
+
+
+def check_seed(seed):
+    """Raise ValueError unless seed fits in a replay header"""
+    if not 0 <= seed <= MAX_SEED:
+        raise ValueError(f'seed must be between 0 and {MAX_SEED} to be recorded, got {seed}')
+
+
+class Replay:
+    def __init__(self, seed, inputs, score=0, health=0, chunked=False, precise=False):
+        check_seed(seed)
+        self.seed = seed
+        self.inputs = inputs
+        self.score = score
+        self.health = health
+        self.chunked = chunked
+        self.precise = precise
+
+    @property
+    def ticks(self):
+        return len(self.inputs)
+
+    def to_bytes(self):
+        flags = 0
+        if self.chunked:
+            flags |= FLAG_CHUNKED
+        if self.precise:
+            flags |= FLAG_PRECISE
+        header = HEADER.pack(MAGIC, VERSION, self.seed, len(self.inputs),
+                             self.score, self.health, flags)
+        return header + zlib.compress(pack_inputs(self.inputs), 9)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER_V1.size:
+            raise ReplayError('replay is truncated')
+        magic, version, seed, ticks, score, health = HEADER_V1.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError('not a replay file')
+        if version == 1:
+            header = HEADER_V1
+            flags = 0
+        elif version == VERSION:
+            if len(data) < HEADER.size:
+                raise ReplayError('replay is truncated')
+            header = HEADER
+            flags = HEADER.unpack_from(data)[-1]
+        else:
+            raise ReplayError(f'unsupported replay version {version}')
+        try:
+            packed = zlib.decompress(data[header.size:])
+        except zlib.error as e:
+            raise ReplayError(f'corrupt input stream: {e}')
+        if len(packed) != (ticks + 3) // 4:
+            raise ReplayError('input stream does not match tick count')
+        return cls(seed, unpack_inputs(packed, ticks), score, health,
+                   bool(flags & FLAG_CHUNKED), bool(flags & FLAG_PRECISE))
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class Recorder:
+    """Collects the inputs a World was stepped with"""
+
+    def __init__(self, world):
+        # Fail before the game is played rather than when it is saved
+        check_seed(world.seed)
+        self.world = world
+        self.inputs = bytearray()
+
+    def record(self, inputs):
+        self.inputs.append(inputs)
+
+    def replay(self):
+        world = self.world
+        return Replay(world.seed, bytes(self.inputs), world.score, world.boat.health,
+                      world.level is not None, world.masks is not None)
+
+    def save(self, path):
+        self.replay().save(path)
+
+
+def simulate(replay):
+    """Re-run a replay headless and return the resulting World"""
+    level = LevelGenerator(replay.seed) if replay.chunked else None
+    masks = SpriteMasks() if replay.precise else None
+    world = World(replay.seed, level=level, masks=masks)
+    step = world.step
+    for inputs in replay.inputs:
+        step(inputs)
+    return world
+
+
+def verify(replay):
+    """Return True if re-simulating the replay gives its claimed result"""
+    world = simulate(replay)
+    return world.score == replay.score and world.boat.health == replay.health
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m river_adventure_game.replay')
+    commands = parser.add_subparsers(dest='command', required=True)
+    verify_parser = commands.add_parser('verify', help='re-simulate replays and check their results')
+    verify_parser.add_argument('paths', nargs='+')
+    info_parser = commands.add_parser('info', help='show replay headers')
+    info_parser.add_argument('paths', nargs='+')
+    args = parser.parse_args(argv)
+
+    failures = 0
+    total_ticks = 0
+    start = time.perf_counter()
+    for path in args.paths:
+        try:
+            replay = Replay.load(path)
+        except (OSError, ReplayError) as e:
+            print(f'{path}: ERROR {e}')
+            failures += 1
+            continue
+        if args.command == 'info':
+            print(f'{path}: seed={replay.seed} ticks={replay.ticks} '
+                  f'score={replay.score} health={replay.health} '
+                  f"river={'chunked' if replay.chunked else 'random'} "
+                  f"collision={'precise' if replay.precise else 'box'}")
+            continue
+        world = simulate(replay)
+        total_ticks += replay.ticks
+        if world.score == replay.score and world.boat.health == replay.health:
+            print(f'{path}: OK score={world.score} health={world.boat.health}')
+        else:
+            failures += 1
+            print(f'{path}: MISMATCH claimed score={replay.score} health={replay.health}, '
+                  f'simulated score={world.score} health={world.boat.health}')
+
+    if args.command == 'verify':
+        elapsed = time.perf_counter() - start
+        rate = total_ticks / elapsed if elapsed > 0 else 0
+        print(f'{len(args.paths) - failures}/{len(args.paths)} verified, '
+              f'{total_ticks} ticks at {rate:.0f} ticks/s')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""High scores and per-session telemetry in SQLite.
+
+Every finished run is one row of the sessions table: score, survival time,
+hits taken, magnets picked up and a summary of frame times. The game never
+touches the database itself. record() hands the row to a writer thread,
+which batches rows into one transaction. Queries run on a reader thread and
+return futures that the screens poll, so a slow disk never costs a frame.
+The database is in WAL mode, so reads never wait for the writer.
+
+    python -m river_adventure_game.scores --top 10
+"""
+import argparse
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .constants import TICK_RATE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    seed INTEGER NOT NULL,
+    chunked INTEGER NOT NULL,
+    precise INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    ticks INTEGER NOT NULL,
+    hits INTEGER NOT NULL,
+    magnets INTEGER NOT NULL,
+    fps REAL,
+    frame_p50_ms REAL,
+    frame_p99_ms REAL
+);
+CREATE INDEX IF NOT EXISTS sessions_by_score ON sessions (score);
+"""
+
+COLUMNS = ('finished_at', 'seed', 'chunked', 'precise', 'score', 'ticks', 'hits', 'magnets',
+           'fps', 'frame_p50_ms', 'frame_p99_ms')
+INSERT = f"INSERT INTO sessions ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+# Most rows written in one transaction
+BATCH_SIZE = 64
+# Seconds the writer waits for more rows before committing a batch
+BATCH_WAIT = 0.5
+
+
+def default_path():
+    base = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(base, 'river_adventure_game', 'scores.db')
+
+
+def session_row(world, stats=None, finished_at=None):
+    """The sessions row for a finished World, stats from FrameProfiler.stats()"""
+    stats = stats or {}
+    return (
+        time.time() if finished_at is None else finished_at,
+        world.seed,
+        int(world.level is not None),
+        int(world.masks is not None),
+        world.score,
+        world.ticks,
+        world.hits,
+        world.magnets_collected,
+        stats.get('fps'),
+        stats.get('p50_ms'),
+        stats.get('p99_ms'),
+    )
+
+
+def connect(path):
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute('PRAGMA journal_mode=WAL')
+    # WAL keeps commits consistent without a sync on each one
+    connection.execute('PRAGMA synchronous=NORMAL')
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class ScoreStore:
+    """Writes sessions on a background thread and answers queries on another.
+
+    path=None uses ~/.local/share/river_adventure_game/scores.db (or
+    $XDG_DATA_HOME). Call close() to write out pending rows.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_path()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Create the schema before either thread needs it
+        connect(self.path).close()
+        self._rows = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name='scores-writer', daemon=True)
+        self._writer.start()
+        self._reader = None
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix='scores-reader',
+                                            initializer=self._open_reader)
+
+    def record(self, row):
+        """Queue a session_row() for writing, never blocks"""
+        self._rows.put(row)
+
+    def _write_loop(self):
+        connection = connect(self.path)
+        rows = self._rows
+        try:
+            while True:
+                row = rows.get()
+                if row is None:
+                    return
+                batch = [row]
+                # Gather whatever else arrives soon into the same transaction
+                deadline = time.monotonic() + BATCH_WAIT
+                while len(batch) < BATCH_SIZE:
+                    try:
+                        row = rows.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if row is None:
+                        rows.put(None)
+                        break
+                    batch.append(row)
+                try:
+                    with connection:
+                        connection.executemany(INSERT, batch)
+                except sqlite3.Error as e:
+                    # Losing telemetry is better than stopping the game
+                    print(f"Warning: Could not save {len(batch)} session(s): {e}")
+        finally:
+            connection.close()
+
+    def _open_reader(self):
+        self._reader = connect(self.path)
+
+    def top_scores(self, count=5):
+        """Future of the count best (score, ticks, finished_at) rows"""
+        return self._executor.submit(self._top_scores, count)
+
+    def _top_scores(self, count):
+        return self._reader.execute(
+            'SELECT score, ticks, finished_at FROM sessions ORDER BY score DESC, id LIMIT ?',
+            (count,)).fetchall()
+
+    def count(self):
+        """Future of the number of runs recorded"""
+        return self._executor.submit(self._count)
+
+    def _count(self):
+        return self._reader.execute('SELECT COUNT(*) FROM sessions').fetchone()[0]
+
+    def rank(self, score, before=None):
+        """Future of (runs scoring below score, runs in total).
+
+        With before, a time.time() value, only runs finished earlier count.
+        """
+        return self._executor.submit(self._rank, score, before)
+
+    def _rank(self, score, before):
+        if before is None:
+            before = float('inf')
+        return self._reader.execute(
+            'SELECT COUNT(*) FILTER (WHERE score < ?), COUNT(*) FROM sessions WHERE finished_at < ?',
+            (score, before)).fetchone()
+
+    def percentiles(self, fractions=(0.5, 0.9, 0.99)):
+        """Future of the score at each fraction of all runs, None if there are none"""
+        return self._executor.submit(self._percentiles, fractions)
+
+    def _percentiles(self, fractions):
+        reader = self._reader
+        total = self._count()
+        if not total:
+            return None
+        # Read off the score index, without sorting the table
+        return [reader.execute('SELECT score FROM sessions ORDER BY score LIMIT 1 OFFSET ?',
+                               (min(total - 1, int(fraction * total)),)).fetchone()[0]
+                for fraction in fractions]
+
+    def close(self):
+        """Write out every queued row and stop both threads"""
+        self._rows.put(None)
+        self._writer.join()
+        self._executor.submit(self._close_reader).result()
+        self._executor.shutdown()
+
+    def _close_reader(self):
+        self._reader.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m river_adventure_game.scores')
+    parser.add_argument('--db', metavar='PATH', help=f'score database (default {default_path()})')
+    parser.add_argument('--top', type=int, default=10, help='number of best runs to list')
+    args = parser.parse_args(argv)
+
+    store = ScoreStore(args.db)
+    try:
+        top = store.top_scores(args.top).result()
+        percentiles = store.percentiles().result()
+        total = store.count().result()
+    finally:
+        store.close()
+    if not total:
+        print('no runs recorded')
+        return 0
+    for place, (score, ticks, finished_at) in enumerate(top, 1):
+        when = time.strftime('%Y-%m-%d %H:%M', time.localtime(finished_at))
+        print(f'{place:>3}. {score:>6}  {ticks / TICK_RATE:>7.1f}s  {when}')
+    median, p90, p99 = percentiles
+    print(f'{total} runs, median {median}, p90 {p90}, p99 {p99}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
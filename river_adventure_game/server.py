@@ -0,0 +1,340 @@
+"""Authoritative multiplayer server.
+
+Clients connect over TCP and join a room by name; each room is a
+SharedWorld with one boat per client. A single asyncio task steps every
+room at TICK_RATE and every SNAPSHOT_TICKS ticks encodes one delta snapshot
+per room, which is written to all of the room's clients, so the cost of a
+room hardly grows with its players. Clients only send their held keys when
+they change.
+
+Bandwidth per client is bounded by the snapshot rate times --budget bytes.
+A client that stops reading is skipped once BUFFER_LIMIT bytes are queued
+for it, and brought back with a full snapshot when it catches up.
+
+    python -m river_adventure_game.server --port 8765
+    python -m river_adventure_game.server --loopback 200 --clients 2 --seconds 10
+
+--loopback hosts the given number of rooms with scripted clients connected
+over 127.0.0.1 in the same process, then reports the server's share of the
+CPU, the bandwidth per client and whether every client's copy of its room
+matches the server's.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import deque
+
+from .constants import TICK_RATE, TICK_SECONDS, MAX_FRAME_TIME, SCROLL_SPEED
+from .level import LevelGenerator
+from .multiplayer import SharedWorld
+from .profiler import percentile
+from .protocol import (
+    MSG_JOIN, MSG_INPUT, MSG_WELCOME, FRAME, INPUT, WELCOME, MAX_CLIENT_MESSAGE,
+    Baseline, Mirror, frame, encode_delta, encode_full,
+)
+from .world import INPUT_LEFT, INPUT_RIGHT
+
+# Ticks between snapshots, 20 a second
+SNAPSHOT_TICKS = 3
+# Largest snapshot before new and corrected entities are held back
+SNAPSHOT_BUDGET = 1200
+# Bytes queued for a client before it is skipped
+BUFFER_LIMIT = 64 * 1024
+# Boats per room, ids are one byte
+MAX_PLAYERS = 8
+# Connections the OS may queue before the server accepts them
+LISTEN_BACKLOG = 1024
+
+
+class Connection:
+    __slots__ = ('writer', 'room', 'player', 'needs_full', 'bytes_sent')
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.room = None
+        self.player = None
+        # Set until the client has been sent the room as it stands
+        self.needs_full = True
+        self.bytes_sent = 0
+
+    def send(self, data):
+        self.writer.write(data)
+        self.bytes_sent += len(data)
+
+
+class Room:
+    """One river and the connections playing on it"""
+
+    def __init__(self, name, chunked=False, budget=SNAPSHOT_BUDGET):
+        self.name = name
+        self.chunked = chunked
+        self.budget = budget
+        self.connections = []
+        self.baseline = Baseline()
+        self.world = None
+        self.restart()
+
+    def restart(self, seed=None):
+        """Start a new river, keeping every connected player"""
+        if seed is None:
+            seed = random.getrandbits(32)
+        if self.world is not None:
+            self.close()
+        level = LevelGenerator(seed) if self.chunked else None
+        self.world = SharedWorld(seed, level=level)
+        self.baseline.clear()
+        for connection in self.connections:
+            connection.player = self.world.add_player(connection.player.id)
+            self._welcome(connection)
+
+    def _welcome(self, connection):
+        world = self.world
+        connection.send(frame(WELCOME.pack(MSG_WELCOME, connection.player.id,
+                                           world.seed, world.ticks)))
+        connection.needs_full = True
+
+    def join(self, connection):
+        """Add a boat for connection, False if the room is full"""
+        taken = {other.player.id for other in self.connections}
+        free = [player_id for player_id in range(MAX_PLAYERS) if player_id not in taken]
+        if not free:
+            return False
+        connection.room = self
+        connection.player = self.world.add_player(free[0])
+        self.connections.append(connection)
+        self._welcome(connection)
+        return True
+
+    def leave(self, connection):
+        self.connections.remove(connection)
+        self.world.remove_player(connection.player.id)
+
+    def close(self):
+        if self.world.level is not None:
+            self.world.level.close()
+
+    def step(self):
+        world = self.world
+        if world.game_over:
+            self.restart()
+        else:
+            world.step()
+
+    def broadcast(self):
+        """Send the changes since the last broadcast to every connection"""
+        delta = encode_delta(self.world, self.baseline, self.budget)
+        full = None
+        for connection in self.connections:
+            if connection.writer.transport.get_write_buffer_size() > BUFFER_LIMIT:
+                # Not keeping up, catch it up in one go once it drains
+                connection.needs_full = True
+            elif connection.needs_full:
+                if full is None:
+                    full = encode_full(self.baseline, self.world.ticks)
+                connection.send(full)
+                connection.needs_full = False
+            else:
+                connection.send(delta)
+
+
+class Server:
+    """Hosts any number of rooms on one event loop"""
+
+    def __init__(self, chunked=False, budget=SNAPSHOT_BUDGET, snapshot_ticks=SNAPSHOT_TICKS):
+        self.chunked = chunked
+        self.budget = budget
+        self.snapshot_ticks = snapshot_ticks
+        self.rooms = {}
+        self.ticks = 0
+        # Seconds spent stepping and broadcasting, in total and for the
+        # last minute of ticks
+        self.busy = 0.0
+        self.tick_times = deque(maxlen=60 * TICK_RATE)
+        self.dropped_ticks = 0
+
+    async def handle(self, reader, writer):
+        """Serve one client: a JOIN, then INPUT messages until it leaves"""
+        connection = Connection(writer)
+        try:
+            payload = await self._read(reader)
+            if payload[0] != MSG_JOIN:
+                return
+            name = payload[1:].decode('utf-8', 'replace')
+            room = self.rooms.get(name)
+            if room is None:
+                room = self.rooms[name] = Room(name, self.chunked, self.budget)
+            if not room.join(connection):
+                return
+            while True:
+                payload = await self._read(reader)
+                if payload[0] == MSG_INPUT and len(payload) == INPUT.size:
+                    connection.player.inputs = payload[1] & (INPUT_LEFT | INPUT_RIGHT)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            room = connection.room
+            if room is not None:
+                room.leave(connection)
+                if not room.connections:
+                    del self.rooms[room.name]
+                    room.close()
+            writer.close()
+
+    @staticmethod
+    async def _read(reader):
+        size, = FRAME.unpack(await reader.readexactly(FRAME.size))
+        if not 0 < size <= MAX_CLIENT_MESSAGE:
+            raise ValueError(f'bad message size {size}')
+        return await reader.readexactly(size)
+
+    def tick(self):
+        start = time.perf_counter()
+        self.ticks += 1
+        broadcast = self.ticks % self.snapshot_ticks == 0
+        for room in list(self.rooms.values()):
+            room.step()
+            if broadcast:
+                room.broadcast()
+        elapsed = time.perf_counter() - start
+        self.busy += elapsed
+        self.tick_times.append(elapsed)
+
+    async def run(self):
+        """Step every room at TICK_RATE until cancelled"""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            self.tick()
+            next_tick += TICK_SECONDS
+            delay = next_tick - loop.time()
+            if delay < -MAX_FRAME_TIME:
+                # Too far behind to catch up, drop the missed ticks
+                missed = int(-delay / TICK_SECONDS)
+                self.dropped_ticks += missed
+                next_tick += missed * TICK_SECONDS
+                delay += missed * TICK_SECONDS
+            await asyncio.sleep(max(0.0, delay))
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle, host, port, backlog=LISTEN_BACKLOG)
+        ticker = asyncio.ensure_future(self.run())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            ticker.cancel()
+
+
+class Client:
+    """A scripted client that joins a room, holds random keys and mirrors the room"""
+
+    def __init__(self, room_name, seed=None):
+        self.room_name = room_name
+        self.mirror = Mirror()
+        self.rng = random.Random(seed)
+        self.bytes_received = 0
+        self._writer = None
+
+    async def run(self, host, port):
+        reader, self._writer = await asyncio.open_connection(host, port)
+        self._writer.write(frame(bytes([MSG_JOIN]) + self.room_name.encode()))
+        keys = asyncio.ensure_future(self._press_keys())
+        try:
+            while True:
+                size, = FRAME.unpack(await reader.readexactly(FRAME.size))
+                self.mirror.apply(await reader.readexactly(size))
+                self.bytes_received += FRAME.size + size
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            keys.cancel()
+            self._writer.close()
+
+    async def _press_keys(self):
+        rng = self.rng
+        while True:
+            inputs = rng.choice((0, INPUT_LEFT, INPUT_RIGHT))
+            self._writer.write(frame(INPUT.pack(MSG_INPUT, inputs)))
+            await asyncio.sleep(rng.uniform(0.1, 1.0))
+
+
+def in_sync(mirror, room):
+    """True if mirror knows what the server has sent room's players"""
+    if mirror.baseline.boats != room.baseline.boats:
+        return False
+    tick = room.world.ticks
+    server = sorted((key & 3, x, y + (tick - sent) * SCROLL_SPEED)
+                    for key, (x, y, sent) in room.baseline.entities.items())
+    return sorted(mirror.entities(tick)) == server
+
+
+async def loopback(rooms, clients, seconds, chunked=False, budget=SNAPSHOT_BUDGET):
+    server = Server(chunked, budget)
+    listener = await asyncio.start_server(server.handle, '127.0.0.1', 0, backlog=LISTEN_BACKLOG)
+    port = listener.sockets[0].getsockname()[1]
+    bots = [Client(f'room{room}', seed=room * MAX_PLAYERS + index)
+            for room in range(rooms) for index in range(clients)]
+    tasks = [asyncio.ensure_future(bot.run('127.0.0.1', port)) for bot in bots]
+    while sum(len(room.connections) for room in server.rooms.values()) < len(bots):
+        for task in tasks:
+            if task.done():
+                # A client that could not connect, raise its error
+                task.result()
+                raise ConnectionError('a client disconnected before the run started')
+        await asyncio.sleep(0.05)
+
+    ticker = asyncio.ensure_future(server.run())
+    start = time.perf_counter()
+    await asyncio.sleep(seconds)
+    ticker.cancel()
+    elapsed = time.perf_counter() - start
+    # Let the last snapshots arrive
+    await asyncio.sleep(0.5)
+    synced = sum(in_sync(bot.mirror, server.rooms[bot.room_name]) for bot in bots)
+
+    listener.close()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    times = sorted(server.tick_times)
+    rates = [bot.bytes_received / elapsed for bot in bots]
+    print(f'{rooms} rooms, {len(bots)} clients, {server.ticks} ticks in {elapsed:.1f}s '
+          f'({server.ticks / elapsed:.1f}/s, {server.dropped_ticks} dropped)')
+    print(f'server CPU: {server.busy / elapsed:.1%} of one core, tick mean '
+          f'{server.busy / server.ticks * 1000:.2f} ms, p99 {percentile(times, 0.99) * 1000:.2f} ms')
+    print(f'per client: mean {sum(rates) / len(rates) / 1024:.2f} KiB/s, '
+          f'max {max(rates) / 1024:.2f} KiB/s '
+          f'(cap {budget * TICK_RATE / server.snapshot_ticks / 1024:.1f} KiB/s)')
+    print(f'clients in sync with the server: {synced}/{len(bots)}')
+    return synced == len(bots)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m river_adventure_game.server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--chunked', action='store_true', help='play generated rivers')
+    parser.add_argument('--budget', type=int, default=SNAPSHOT_BUDGET,
+                        help=f'largest snapshot in bytes (default {SNAPSHOT_BUDGET})')
+    parser.add_argument('--loopback', type=int, metavar='ROOMS',
+                        help='host ROOMS rooms of local scripted clients and report')
+    parser.add_argument('--clients', type=int, default=2, help='clients per loopback room')
+    parser.add_argument('--seconds', type=float, default=10, help='length of the loopback run')
+    args = parser.parse_args(argv)
+
+    if args.loopback:
+        ok = asyncio.run(loopback(args.loopback, min(args.clients, MAX_PLAYERS), args.seconds,
+                                  args.chunked, args.budget))
+        return 0 if ok else 1
+    try:
+        asyncio.run(Server(args.chunked, args.budget).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""Cached sprite variants.
+
+Menus used to scale images and draw fresh particle surfaces every frame.
+SpriteCache builds each variant the first time it is asked for and keeps
+the most recently used ones, so the frame loop only blits.
+"""
+from collections import OrderedDict
+
+import pygame
+
+SPRITE_CACHE_SIZE = 128
+
+# Particle alphas are snapped to this step to bound the number of stamps
+ALPHA_STEP = 10
+
+
+class SpriteCache:
+    """Least recently used cache of scaled images and circle stamps"""
+
+    def __init__(self, max_entries=SPRITE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def _get(self, key, build):
+        surfaces = self._surfaces
+        surface = surfaces.get(key)
+        if surface is not None:
+            surfaces.move_to_end(key)
+            return surface
+        surface = build()
+        surfaces[key] = surface
+        if len(surfaces) > self.max_entries:
+            surfaces.popitem(last=False)
+        return surface
+
+    def scaled(self, image, size):
+        """image scaled to size, a (width, height) of ints"""
+        return self._get(('scaled', image, size),
+                         lambda: pygame.transform.scale(image, size))
+
+    def circle(self, radius, color):
+        """A filled circle of radius on a transparent square of twice its size.
+
+        color may carry an alpha, which is rounded to ALPHA_STEP.
+        """
+        if len(color) == 4:
+            color = (*color[:3], min(255, round(color[3] / ALPHA_STEP) * ALPHA_STEP))
+        return self._get(('circle', radius, color),
+                         lambda: self._draw_circle(radius, color))
+
+    @staticmethod
+    def _draw_circle(radius, color):
+        surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(surface, color, (radius, radius), radius)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
@@ -0,0 +1,94 @@
+"""Cached text rendering.
+
+Font.render allocates a new surface on every call. TextCache keeps the most
+recently used renders keyed by (font, text, color), and DigitAtlas draws
+changing numbers from ten pre-rendered digit glyphs, so a HUD showing a
+score that changes every few frames does not render text at all.
+"""
+from collections import OrderedDict
+
+import pygame
+
+TEXT_CACHE_SIZE = 256
+
+
+def quantize(value, steps=32):
+    """Snap a 0..1 animation value to a few levels so its renders can be cached"""
+    return round(value * steps) / steps
+
+
+class TextCache:
+    """Least recently used cache of Font.render results"""
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surfaces = self._surfaces
+        surface = surfaces.get(key)
+        if surface is not None:
+            surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        surfaces[key] = surface
+        if len(surfaces) > self.max_entries:
+            surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+class DigitAtlas:
+    """Draws "<prefix><number><suffix>" in one font and color.
+
+    The line is composited from cached label and digit glyph surfaces when
+    the value changes, and the result is kept, so an unchanged value costs a
+    single blit.
+    """
+
+    def __init__(self, font, color, cache):
+        self.font = font
+        self.color = color
+        self.cache = cache
+        self.glyphs = {char: font.render(char, True, color) for char in '-0123456789'}
+        self._key = None
+        self._line = None
+
+    def line(self, prefix, value, suffix=''):
+        """Return the composited surface for the given text"""
+        key = (prefix, value, suffix)
+        if key == self._key:
+            return self._line
+        render = self.cache.render
+        pieces = []
+        if prefix:
+            pieces.append(render(self.font, prefix, self.color))
+        glyphs = self.glyphs
+        pieces.extend(glyphs[char] for char in str(value))
+        if suffix:
+            pieces.append(render(self.font, suffix, self.color))
+
+        width = sum(piece.get_width() for piece in pieces)
+        line = pygame.Surface((width, self.font.get_height()), pygame.SRCALPHA)
+        x = 0
+        for piece in pieces:
+            # Glyphs do not overlap, so taking the maximum copies them exactly
+            line.blit(piece, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            x += piece.get_width()
+        self._key = key
+        self._line = line
+        return line
+
+    def draw(self, surface, pos, prefix, value, suffix=''):
+        """Blit the text at pos and return the rect it covers"""
+        return surface.blit(self.line(prefix, value, suffix), pos)
@@ -0,0 +1,154 @@
+"""Simulation on its own thread, drawn with interpolation.
+
+SimulationThread steps a World at TICK_RATE on a background thread. After
+every tick it captures a Snapshot, an immutable copy of what the renderer
+needs, and publishes it together with the one before as a single tuple.
+The draw loop reads that pair without locks, as the tuple is swapped in
+one assignment and neither snapshot changes afterwards.
+
+Each snapshot is stamped with the time its tick was due. interpolate()
+draws one tick behind, blending every position between the two snapshots
+by how far the present is into the next tick. Motion is then smooth at any
+display refresh rate, and a slow frame only delays the picture: the
+simulation keeps its own pace.
+"""
+import threading
+import time
+
+from .constants import TICK_RATE, TICK_SECONDS, MAX_FRAME_TIME, SCROLL_SPEED
+
+
+class Snapshot:
+    """The drawable state of a World after one tick"""
+    __slots__ = ('time', 'ticks', 'boat', 'health', 'score', 'magnet_active', 'magnet_end_time',
+                 'crash_effect_time', 'screen_shake', 'game_over', 'stones', 'coins', 'magnets')
+
+    def __init__(self, world, due):
+        boat = world.boat
+        # perf_counter() time the tick was scheduled for
+        self.time = due
+        self.ticks = world.ticks
+        self.boat = (boat.x, boat.y)
+        self.health = boat.health
+        self.score = world.score
+        self.magnet_active = world.magnet_active
+        self.magnet_end_time = world.magnet_end_time
+        self.crash_effect_time = boat.crash_effect_time
+        self.screen_shake = world.screen_shake
+        self.game_over = world.game_over
+        # serial -> (x, y) for each kind
+        self.stones = {stone.serial: (stone.x, stone.y) for stone in world.stones}
+        self.coins = {coin.serial: (coin.x, coin.y) for coin in world.coins}
+        self.magnets = {magnet.serial: (magnet.x, magnet.y) for magnet in world.magnets}
+
+
+class SimulationThread(threading.Thread):
+    """Steps world at TICK_RATE until it is over or stop() is called.
+
+    Set inputs from the draw loop; every tick uses the latest value. If a
+    recorder is given, each tick's inputs are passed to it from this thread.
+    """
+
+    def __init__(self, world, recorder=None):
+        super().__init__(name='simulation', daemon=True)
+        self.world = world
+        self.recorder = recorder
+        self.inputs = 0
+        # Ticks dropped because the thread fell more than MAX_FRAME_TIME behind
+        self.dropped_ticks = 0
+        self._stop_event = threading.Event()
+        start = Snapshot(world, time.perf_counter())
+        self._snapshots = (start, start)
+
+    def snapshots(self):
+        """The (previous, latest) snapshots"""
+        return self._snapshots
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def run(self):
+        world = self.world
+        recorder = self.recorder
+        stopped = self._stop_event.is_set
+        due = time.perf_counter()
+        while not world.game_over and not stopped():
+            due += TICK_SECONDS
+            now = time.perf_counter()
+            if due > now:
+                time.sleep(due - now)
+            elif now - due > MAX_FRAME_TIME:
+                # Too far behind to catch up, skip to the present
+                missed = int((now - due) / TICK_SECONDS)
+                self.dropped_ticks += missed
+                due += missed * TICK_SECONDS
+            inputs = self.inputs
+            world.step(inputs)
+            if recorder:
+                recorder.record(inputs)
+            self._snapshots = (self._snapshots[1], Snapshot(world, due))
+
+
+class _Sprite:
+    __slots__ = ('x', 'y')
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class _Boat(_Sprite):
+    __slots__ = ('health',)
+
+    def __init__(self, x, y, health):
+        super().__init__(x, y)
+        self.health = health
+
+
+class InterpolatedView:
+    """Read-only stand-in for a World that Renderer.draw_world can draw"""
+
+    def __init__(self, previous, latest, amount):
+        self.ticks = latest.ticks - 1 + amount
+        self.score = latest.score
+        self.magnet_active = latest.magnet_active
+        self.screen_shake = latest.screen_shake
+        self.game_over = latest.game_over
+        self._latest = latest
+        x0, y0 = previous.boat
+        x1, y1 = latest.boat
+        self.boat = _Boat(x0 + (x1 - x0) * amount, y0 + (y1 - y0) * amount, latest.health)
+        self.stones = _blend(previous.stones, latest.stones, amount)
+        self.coins = _blend(previous.coins, latest.coins, amount)
+        self.magnets = _blend(previous.magnets, latest.magnets, amount)
+
+    def crash_effect_active(self):
+        return self._latest.ticks < self._latest.crash_effect_time
+
+    def magnet_time_left(self):
+        return (self._latest.magnet_end_time - self._latest.ticks) // TICK_RATE
+
+
+def _blend(previous, latest, amount):
+    sprites = []
+    for serial, (x1, y1) in latest.items():
+        start = previous.get(serial)
+        if start is None:
+            # Spawned this tick, slide it in from where it would have been
+            x0, y0 = x1, y1 - SCROLL_SPEED
+        else:
+            x0, y0 = start
+        sprites.append(_Sprite(x0 + (x1 - x0) * amount, y0 + (y1 - y0) * amount))
+    return sprites
+
+
+def interpolate(snapshots, now=None):
+    """InterpolatedView between a (previous, latest) pair for time now"""
+    previous, latest = snapshots
+    if now is None:
+        now = time.perf_counter()
+    amount = min(max((now - latest.time) / TICK_SECONDS, 0.0), 1.0)
+    if previous is latest:
+        amount = 1.0
+    return InterpolatedView(previous, latest, amount)
@@ -0,0 +1,217 @@
+"""Batched simulation of many independent games with NumPy.
+
+VectorRiver keeps N games as struct-of-arrays and advances all of them with
+one step(actions) call, following the same rules as World.step: the same
+movement, spawn rolls, stone spacing check, magnet attraction and rect
+collisions. Each game's objects live in fixed-size slot arrays, so a spawn
+is dropped if every slot of its kind is already taken; the default
+capacities are well above what the spawn rates produce.
+
+Collisions are box against box only. There is nothing like World's
+pixel-precise masks, which the game plays with, so tuning that has to
+match play should use bench --precise.
+
+The random numbers come from one NumPy generator for the whole batch, so a
+VectorRiver game does not replay the same river as a World with the same
+seed. Requires NumPy.
+"""
+import numpy as np
+
+from .constants import (
+    WINDOW_WIDTH, WINDOW_HEIGHT,
+    BOAT_WIDTH, BOAT_HEIGHT, STONE_WIDTH, STONE_HEIGHT, COIN_SIZE, MAGNET_SIZE,
+    SCROLL_SPEED, PLAYER_SPEED,
+    STONE_SPAWN_RATE, COIN_SPAWN_RATE, MAGNET_SPAWN_RATE,
+)
+from .world import (
+    INPUT_LEFT, INPUT_RIGHT, MAGNET_TICKS, INVULNERABLE_TICKS, CRASH_EFFECT_TICKS,
+)
+
+BOAT_START_X = WINDOW_WIDTH // 2 - BOAT_WIDTH // 2
+BOAT_Y = WINDOW_HEIGHT // 2 + 50
+START_HEALTH = 3
+
+
+def _rect_round(values):
+    # pygame.Rect rounds float coordinates half away from zero
+    return np.copysign(np.floor(np.abs(values) + 0.5), values)
+
+
+def _hits_boat(boat_x, x, y, width, height):
+    """colliderect of every (x, y, width, height) slot against each game's boat"""
+    boat_x = boat_x[:, None]
+    return ((x < boat_x + BOAT_WIDTH) & (x + width > boat_x)
+            & (y < BOAT_Y + BOAT_HEIGHT) & (y + height > BOAT_Y))
+
+
+class VectorRiver:
+    """N independent games advanced together"""
+
+    def __init__(self, num_games, seed=None, max_stones=16, max_coins=16, max_magnets=4,
+                 stone_spawn_rate=STONE_SPAWN_RATE, coin_spawn_rate=COIN_SPAWN_RATE,
+                 magnet_spawn_rate=MAGNET_SPAWN_RATE):
+        self.num_games = num_games
+        self.rng = np.random.default_rng(seed)
+        self.stone_spawn_rate = stone_spawn_rate
+        self.coin_spawn_rate = coin_spawn_rate
+        self.magnet_spawn_rate = magnet_spawn_rate
+        n = num_games
+
+        # Zeroed, so dead slots never feed garbage into the array math
+        self.boat_x = np.zeros(n, dtype=np.int32)
+        self.health = np.zeros(n, dtype=np.int32)
+        self.score = np.zeros(n, dtype=np.int32)
+        self.ticks = np.zeros(n, dtype=np.int32)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.screen_shake = np.zeros(n, dtype=np.int32)
+        self.invulnerable_time = np.zeros(n, dtype=np.int32)
+        self.crash_effect_time = np.zeros(n, dtype=np.int32)
+        self.magnet_active = np.zeros(n, dtype=bool)
+        self.magnet_end_time = np.zeros(n, dtype=np.int32)
+
+        self.stone_x = np.zeros((n, max_stones), dtype=np.int32)
+        self.stone_y = np.zeros((n, max_stones), dtype=np.int32)
+        self.stone_alive = np.zeros((n, max_stones), dtype=bool)
+        # Spawn order of each stone, World removes the oldest of several hits
+        self.stone_order = np.zeros((n, max_stones), dtype=np.int64)
+        self.coin_x = np.zeros((n, max_coins), dtype=np.float64)
+        self.coin_y = np.zeros((n, max_coins), dtype=np.float64)
+        self.coin_alive = np.zeros((n, max_coins), dtype=bool)
+        self.magnet_x = np.zeros((n, max_magnets), dtype=np.int32)
+        self.magnet_y = np.zeros((n, max_magnets), dtype=np.int32)
+        self.magnet_alive = np.zeros((n, max_magnets), dtype=bool)
+        self._spawn_count = 0
+
+        self.reset()
+
+    def reset(self, games=None):
+        """Restart the given games (a boolean mask or indices), or all of them"""
+        if games is None:
+            games = slice(None)
+        self.boat_x[games] = BOAT_START_X
+        self.health[games] = START_HEALTH
+        self.score[games] = 0
+        self.ticks[games] = 0
+        self.game_over[games] = False
+        self.screen_shake[games] = 0
+        self.invulnerable_time[games] = 0
+        self.crash_effect_time[games] = 0
+        self.magnet_active[games] = False
+        self.magnet_end_time[games] = 0
+        self.stone_alive[games] = False
+        self.coin_alive[games] = False
+        self.magnet_alive[games] = False
+
+    def _spawn(self, active, rate, alive, x, y, width, height, extra=None):
+        """Roll a spawn for every active game and fill the first free slot"""
+        n = self.num_games
+        rng = self.rng
+        roll = active & (rng.integers(1, rate + 1, size=n) == 1)
+        spawn_x = rng.integers(0, WINDOW_WIDTH - width + 1, size=n)
+        if extra is not None:
+            roll &= extra(spawn_x)
+        free = ~alive
+        roll &= free.any(axis=1)
+        games = np.nonzero(roll)[0]
+        slots = free[games].argmax(axis=1)
+        alive[games, slots] = True
+        x[games, slots] = spawn_x[games]
+        y[games, slots] = -height
+        return games, slots
+
+    def _stone_spacing_ok(self, spawn_x):
+        # Check horizontal spacing to avoid clustering
+        near = (self.stone_alive & (self.stone_y < 150)
+                & (np.abs(self.stone_x - spawn_x[:, None]) < 250))
+        return ~near.any(axis=1)
+
+    def step(self, actions):
+        """Advance every unfinished game by one tick.
+
+        actions is an array of INPUT_* bits, one per game. Finished games are
+        left untouched until reset().
+        """
+        actions = np.asarray(actions)
+        active = ~self.game_over
+        ticks = self.ticks
+        ticks += active
+        self.screen_shake[active] = np.maximum(0, self.screen_shake[active] - 1)
+
+        # Movement
+        boat_x = self.boat_x
+        move = active & ((actions & INPUT_LEFT) != 0) & (boat_x > 0)
+        boat_x -= PLAYER_SPEED * move
+        move = active & ((actions & INPUT_RIGHT) != 0) & (boat_x < WINDOW_WIDTH - BOAT_WIDTH)
+        boat_x += PLAYER_SPEED * move
+
+        # Check if magnet power-up is active
+        self.magnet_active &= ~(active & (ticks > self.magnet_end_time))
+
+        # Spawn objects
+        games, slots = self._spawn(active, self.stone_spawn_rate, self.stone_alive,
+                                   self.stone_x, self.stone_y, STONE_WIDTH, STONE_HEIGHT,
+                                   self._stone_spacing_ok)
+        if len(games):
+            self.stone_order[games, slots] = self._spawn_count + np.arange(len(games))
+            self._spawn_count += len(games)
+        self._spawn(active, self.coin_spawn_rate, self.coin_alive,
+                    self.coin_x, self.coin_y, COIN_SIZE, COIN_SIZE)
+        self._spawn(active, self.magnet_spawn_rate, self.magnet_alive,
+                    self.magnet_x, self.magnet_y, MAGNET_SIZE, MAGNET_SIZE)
+
+        self._update_stones(active)
+        self._update_coins(active)
+        self._update_magnets(active)
+
+    def _update_stones(self, active):
+        alive = self.stone_alive & active[:, None]
+        self.stone_y += SCROLL_SPEED * alive
+        hit = alive & _hits_boat(self.boat_x, self.stone_x, self.stone_y,
+                                 STONE_WIDTH, STONE_HEIGHT)
+
+        # Only the oldest colliding stone can do damage, the rest are ignored
+        # while the boat is invulnerable
+        damaged = hit.any(axis=1) & (self.ticks > self.invulnerable_time)
+        games = np.nonzero(damaged)[0]
+        if len(games):
+            order = np.where(hit[games], self.stone_order[games], np.iinfo(np.int64).max)
+            self.stone_alive[games, order.argmin(axis=1)] = False
+            ticks = self.ticks[games]
+            self.health[games] -= 1
+            self.invulnerable_time[games] = ticks + INVULNERABLE_TICKS
+            self.crash_effect_time[games] = ticks + CRASH_EFFECT_TICKS
+            self.screen_shake[games] = 10
+            self.game_over[games] |= self.health[games] <= 0
+
+        # Remove if off screen
+        self.stone_alive &= ~(alive & ~hit & (self.stone_y > WINDOW_HEIGHT))
+
+    def _update_coins(self, active):
+        alive = self.coin_alive & active[:, None]
+        attracted = alive & self.magnet_active[:, None]
+        falling = alive & ~attracted
+
+        # Move toward boat when magnet is active
+        dx = (self.boat_x[:, None] + BOAT_WIDTH / 2) - (self.coin_x + COIN_SIZE / 2)
+        dy = (BOAT_Y + BOAT_HEIGHT / 2) - (self.coin_y + COIN_SIZE / 2)
+        dist = np.maximum(1, np.sqrt(dx * dx + dy * dy))
+        self.coin_x += np.where(attracted, dx / dist * 5, 0)
+        self.coin_y += np.where(attracted, dy / dist * 5, 0)
+        self.coin_y += SCROLL_SPEED * falling
+
+        hit = alive & _hits_boat(self.boat_x, _rect_round(self.coin_x),
+                                 _rect_round(self.coin_y), COIN_SIZE, COIN_SIZE)
+        self.score += 10 * hit.sum(axis=1, dtype=np.int32)
+        # Remove if collected or off screen
+        self.coin_alive &= ~(hit | (alive & (self.coin_y > WINDOW_HEIGHT)))
+
+    def _update_magnets(self, active):
+        alive = self.magnet_alive & active[:, None]
+        self.magnet_y += SCROLL_SPEED * alive
+        hit = alive & _hits_boat(self.boat_x, self.magnet_x, self.magnet_y,
+                                 MAGNET_SIZE, MAGNET_SIZE)
+        picked = hit.any(axis=1)
+        self.magnet_active |= picked
+        self.magnet_end_time[picked] = self.ticks[picked] + MAGNET_TICKS
+        # Remove if collected or off screen
+        self.magnet_alive &= ~(hit | (alive & (self.magnet_y > WINDOW_HEIGHT)))
@@ -0,0 +1,416 @@
+"""Headless game simulation.
+
+Nothing in here touches the display, loads assets or waits on a clock, so a
+World can be stepped as fast as the CPU allows. Each World draws from its own
+seeded RNG and counts time in ticks, so the same seed and the same inputs
+always play out the same way.
+"""
+import random
+
+import pygame
+
+from .constants import (
+    WINDOW_WIDTH, WINDOW_HEIGHT, TICK_RATE,
+    BOAT_WIDTH, BOAT_HEIGHT, STONE_WIDTH, STONE_HEIGHT, COIN_SIZE, MAGNET_SIZE,
+    SCROLL_SPEED, PLAYER_SPEED,
+    STONE_SPAWN_RATE, COIN_SPAWN_RATE, MAGNET_SPAWN_RATE, MAGNET_DURATION,
+    INVULNERABLE_DURATION, CRASH_EFFECT_DURATION,
+)
+from .pool import Pool
+from .spatial import UniformGrid
+
+# Input bits passed to World.step
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+
+# Timer lengths in ticks
+MAGNET_TICKS = round(MAGNET_DURATION * TICK_RATE)
+INVULNERABLE_TICKS = round(INVULNERABLE_DURATION * TICK_RATE)
+CRASH_EFFECT_TICKS = round(CRASH_EFFECT_DURATION * TICK_RATE)
+
+
+def inputs_from_keys(keys):
+    """Convert a pygame.key.get_pressed() result into World.step input bits"""
+    inputs = 0
+    if keys[pygame.K_LEFT]:
+        inputs |= INPUT_LEFT
+    if keys[pygame.K_RIGHT]:
+        inputs |= INPUT_RIGHT
+    return inputs
+
+
+def _serial(entity):
+    return entity.serial
+
+
+def _nearest(coin, boats):
+    if len(boats) == 1:
+        return boats[0]
+    x = coin.x
+    y = coin.y
+    return min(boats, key=lambda boat: (boat.x - x) ** 2 + (boat.y - y) ** 2)
+
+
+class Boat:
+    def __init__(self):
+        self.width = BOAT_WIDTH
+        self.height = BOAT_HEIGHT
+        self.x = WINDOW_WIDTH // 2 - self.width // 2
+        # Position the boat more toward the center of the screen
+        self.y = WINDOW_HEIGHT // 2 + 50
+        self.speed = PLAYER_SPEED
+        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        self.health = 3
+        self.invulnerable_time = 0
+        self.crash_effect_time = 0
+
+    def move(self, direction):
+        if direction == 'left' and self.x > 0:
+            self.x -= self.speed
+        if direction == 'right' and self.x < WINDOW_WIDTH - self.width:
+            self.x += self.speed
+        self.rect.x = self.x
+
+    def take_damage(self, tick):
+        if tick > self.invulnerable_time:
+            self.health -= 1
+            self.invulnerable_time = tick + INVULNERABLE_TICKS
+            self.crash_effect_time = tick + CRASH_EFFECT_TICKS
+            return True
+        return False
+
+
+class Stone:
+    __slots__ = ('width', 'height', 'x', 'y', 'speed', 'rect', 'slot', 'serial')
+
+    def __init__(self, x):
+        self.width = STONE_WIDTH
+        self.height = STONE_HEIGHT
+        self.speed = SCROLL_SPEED
+        self.rect = pygame.Rect(0, 0, self.width, self.height)
+        self.reset(x)
+
+    def reset(self, x):
+        self.x = x
+        self.y = -self.height
+        self.rect.topleft = (self.x, self.y)
+
+    def update(self):
+        self.y += self.speed
+        self.rect.y = self.y
+
+
+class Coin:
+    __slots__ = ('width', 'height', 'x', 'y', 'speed', 'rect', 'attracted', 'slot', 'serial')
+
+    def __init__(self, x):
+        self.width = COIN_SIZE
+        self.height = COIN_SIZE
+        self.speed = SCROLL_SPEED
+        self.rect = pygame.Rect(0, 0, self.width, self.height)
+        self.reset(x)
+
+    def reset(self, x):
+        self.x = x
+        self.y = -self.height
+        self.rect.topleft = (self.x, self.y)
+        self.attracted = False
+
+    def update(self, boat=None, magnet_active=False):
+        if magnet_active and boat:
+            # Move toward boat when magnet is active
+            self.attracted = True
+            dx = boat.x + boat.width/2 - (self.x + self.width/2)
+            dy = boat.y + boat.height/2 - (self.y + self.height/2)
+            dist = max(1, (dx**2 + dy**2)**0.5)  # Avoid division by zero
+            self.x += dx / dist * 5
+            self.y += dy / dist * 5
+        else:
+            self.y += self.speed
+
+        self.rect.x = self.x
+        self.rect.y = self.y
+
+
+class Magnet:
+    __slots__ = ('width', 'height', 'x', 'y', 'speed', 'rect', 'slot', 'serial')
+
+    def __init__(self, x):
+        self.width = MAGNET_SIZE
+        self.height = MAGNET_SIZE
+        self.speed = SCROLL_SPEED
+        self.rect = pygame.Rect(0, 0, self.width, self.height)
+        self.reset(x)
+
+    def reset(self, x):
+        self.x = x
+        self.y = -self.height
+        self.rect.topleft = (self.x, self.y)
+
+    def update(self):
+        self.y += self.speed
+        self.rect.y = self.y
+
+
+class World:
+    """One game's worth of state, advanced one tick at a time by step()
+
+    The spawn rates default to the game constants and can be overridden to
+    try out other difficulty settings. If level is a LevelGenerator, the
+    river comes from its chunks instead and the spawn rates are unused.
+    masks, a masks.SpriteMasks, makes collisions pixel-precise instead of
+    box against box.
+    """
+
+    def __init__(self, seed=None, stone_spawn_rate=STONE_SPAWN_RATE,
+                 coin_spawn_rate=COIN_SPAWN_RATE, magnet_spawn_rate=MAGNET_SPAWN_RATE,
+                 level=None, masks=None):
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.stone_spawn_rate = stone_spawn_rate
+        self.coin_spawn_rate = coin_spawn_rate
+        self.magnet_spawn_rate = magnet_spawn_rate
+        self.level = level
+        self.masks = masks
+        self.boat = Boat()
+        # Entities are recycled through pools, the live ones are plain lists
+        # in no particular order
+        self.stone_pool = Pool(Stone)
+        self.coin_pool = Pool(Coin)
+        self.magnet_pool = Pool(Magnet)
+        self._pools = {Stone: self.stone_pool, Coin: self.coin_pool, Magnet: self.magnet_pool}
+        # Pools by level spawn kind
+        self._level_pools = (self.stone_pool, self.coin_pool, self.magnet_pool)
+        self.stones = self.stone_pool.active
+        self.coins = self.coin_pool.active
+        self.magnets = self.magnet_pool.active
+        # Broad phase over every stone, coin and magnet, used by the
+        # collision pass and the stone spacing check
+        self.grid = UniformGrid()
+        self.score = 0
+        # Totals for telemetry
+        self.hits = 0
+        self.magnets_collected = 0
+        self.magnet_active = False
+        self.magnet_end_time = 0
+        self.game_over = False
+        self.screen_shake = 0
+        # Simulation time in ticks, used instead of the wall clock
+        self.ticks = 0
+        # Optional FrameProfiler, charged per phase of each step
+        self.profiler = None
+        # Scratch lists reused every tick
+        self._off_screen = []
+        self._stone_hits = []
+        self._coin_hits = []
+        self._magnet_hits = []
+        # ids of entities used up this tick
+        self._taken = set()
+        self._spacing_rect = pygame.Rect(0, -STONE_HEIGHT, 499, 150 + STONE_HEIGHT)
+
+    def step(self, inputs):
+        """Advance the simulation by one tick using INPUT_* bits"""
+        if self.game_over:
+            return
+        self.ticks += 1
+        self.screen_shake = max(0, self.screen_shake - 1)
+        boat = self.boat
+
+        if inputs & INPUT_LEFT:
+            boat.move('left')
+        if inputs & INPUT_RIGHT:
+            boat.move('right')
+
+        # Check if magnet power-up is active
+        if self.magnet_active and self.ticks > self.magnet_end_time:
+            self.magnet_active = False
+            self._magnet_ended()
+
+        self._spawn()
+        profiler = self.profiler
+        if profiler:
+            profiler.lap('spawn')
+
+        players = (self,)
+        self._update_entities(players if self.magnet_active else (), players)
+        if profiler:
+            profiler.lap('update')
+
+        self._collide(players)
+        if profiler:
+            profiler.lap('collision')
+
+    # The phases of a tick below work on players: objects with a boat, a
+    # score and a magnet_end_time. Here that is the World itself, in
+    # multiplayer.SharedWorld one Player per boat.
+
+    def _magnet_ended(self):
+        # Coins were pulled around outside the grid, bring it up to date
+        for coin in self.coins:
+            self.grid.move(coin)
+
+    def _spawn(self):
+        """Spawn this tick's stones, coins and magnets"""
+        if self.level is not None:
+            for kind, x in self.level.spawns(self.ticks):
+                self._add(self._level_pools[kind], x)
+        else:
+            self._spawn_random()
+
+    def _update_entities(self, magnet_players, players):
+        """Move every entity one tick, listing those that left the screen.
+
+        While magnet_players is not empty, each coin heads for the nearest
+        of their boats. Every coin is being visited anyway, so it is tested
+        against the boats of players here and its grid cells are left stale
+        until the magnet ends.
+        """
+        off_screen = self._off_screen
+        for stone in self.stones:
+            stone.update()
+            if stone.y > WINDOW_HEIGHT:
+                off_screen.append(stone)
+
+        coin_hits = self._coin_hits
+        if magnet_players:
+            masks = self.masks
+            boats = [player.boat for player in magnet_players]
+            for coin in self.coins:
+                coin.update(_nearest(coin, boats), True)
+                rect = coin.rect
+                for player in players:
+                    boat_rect = player.boat.rect
+                    if rect.colliderect(boat_rect) and (
+                            masks is None or masks.overlap(boat_rect, coin)):
+                        coin_hits.append((player, coin))
+                        break
+                else:
+                    if coin.y > WINDOW_HEIGHT:
+                        off_screen.append(coin)
+        else:
+            for coin in self.coins:
+                coin.update()
+                if coin.y > WINDOW_HEIGHT:
+                    off_screen.append(coin)
+
+        for magnet in self.magnets:
+            magnet.update()
+            if magnet.y > WINDOW_HEIGHT:
+                off_screen.append(magnet)
+
+        self.grid.scroll(SCROLL_SPEED)
+
+    def _collide(self, players):
+        """Look up what each boat touched through the grid and apply it.
+
+        Players are served in order: a stone, coin or magnet touched by
+        several boats goes to the first of them.
+        """
+        tick = self.ticks
+        magnet_active = self.magnet_active
+        masks = self.masks
+        grid = self.grid
+        taken = self._taken
+        stone_hits = self._stone_hits
+        coin_hits = self._coin_hits
+        magnet_hits = self._magnet_hits
+        for player in players:
+            boat = player.boat
+            boat_rect = boat.rect
+            for entity in grid.query(boat_rect):
+                if not boat_rect.colliderect(entity.rect):
+                    continue
+                if masks is not None and not masks.overlap(boat_rect, entity):
+                    continue
+                kind = type(entity)
+                if kind is Stone:
+                    stone_hits.append(entity)
+                elif kind is Magnet:
+                    magnet_hits.append((player, entity))
+                elif not magnet_active:
+                    coin_hits.append((player, entity))
+
+            if stone_hits:
+                # The oldest stone takes the hit, as when stones were kept in
+                # spawn order
+                if len(stone_hits) > 1:
+                    stone_hits.sort(key=_serial)
+                for stone in stone_hits:
+                    if id(stone) not in taken and boat.take_damage(tick):
+                        taken.add(id(stone))
+                        self._remove(stone)
+                        self._crashed(player)
+                stone_hits.clear()
+
+        if coin_hits:
+            for player, coin in coin_hits:
+                if id(coin) not in taken:
+                    taken.add(id(coin))
+                    self._remove(coin)
+                    player.score += 10
+            coin_hits.clear()
+
+        if magnet_hits:
+            for player, magnet in magnet_hits:
+                if id(magnet) not in taken:
+                    taken.add(id(magnet))
+                    self._remove(magnet)
+                    self.magnets_collected += 1
+                    self.magnet_active = True
+                    player.magnet_end_time = tick + MAGNET_TICKS
+            magnet_hits.clear()
+
+        # Remove if off screen
+        off_screen = self._off_screen
+        if off_screen:
+            for entity in off_screen:
+                if id(entity) not in taken:
+                    self._remove(entity)
+            off_screen.clear()
+        taken.clear()
+
+    def _crashed(self, player):
+        """player's boat was damaged by a stone"""
+        self.hits += 1
+        self.screen_shake = 10
+        if player.boat.health <= 0:
+            self.game_over = True
+
+    def _add(self, pool, x):
+        self.grid.insert(pool.spawn(x))
+
+    def _remove(self, entity):
+        self.grid.remove(entity)
+        self._pools[type(entity)].release(entity)
+
+    def _spawn_random(self):
+        randint = self.rng.randint
+        if randint(1, self.stone_spawn_rate) == 1:
+            x = randint(0, WINDOW_WIDTH - STONE_WIDTH)
+            # Check horizontal spacing to avoid clustering, the query rect
+            # covers every stone with y < 150 and x within 250 of the new one
+            spacing_rect = self._spacing_rect
+            spacing_rect.x = x - 249
+            can_spawn = True
+            for existing_stone in self.grid.query(spacing_rect):
+                if (type(existing_stone) is Stone and existing_stone.y < 150
+                        and abs(existing_stone.x - x) < 250):
+                    can_spawn = False
+                    break
+            if can_spawn:
+                self._add(self.stone_pool, x)
+
+        if randint(1, self.coin_spawn_rate) == 1:
+            self._add(self.coin_pool, randint(0, WINDOW_WIDTH - COIN_SIZE))
+
+        if randint(1, self.magnet_spawn_rate) == 1:
+            self._add(self.magnet_pool, randint(0, WINDOW_WIDTH - MAGNET_SIZE))
+
+    def crash_effect_active(self):
+        return self.ticks < self.boat.crash_effect_time
+
+    def magnet_time_left(self):
+        """Whole seconds of magnet time left"""
+        return (self.magnet_end_time - self.ticks) // TICK_RATE
@@ -0,0 +1,55 @@
+import os
+import random
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+import pytest
+
+from river_adventure_game.constants import WINDOW_WIDTH, WINDOW_HEIGHT
+from river_adventure_game.gpu import open_window
+from river_adventure_game.particles import Snowfall
+from river_adventure_game.render import Renderer
+from river_adventure_game.world import World, INPUT_LEFT, INPUT_RIGHT
+
+# Alpha blends round differently in SDL and pygame
+TOLERANCE = 4
+
+
+@pytest.fixture
+def renderers():
+    pygame.init()
+    window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    software = Renderer(window)
+    # Accept SDL's software renderer, there is no GPU under the dummy driver
+    gpu = open_window('test', accelerated=-1)
+    if gpu is None:
+        pygame.quit()
+        pytest.skip('no SDL2 renderer available')
+    yield software, gpu
+    gpu.sdl_window.destroy()
+    pygame.quit()
+
+
+def _pixels(surface):
+    return pygame.surfarray.array3d(surface).astype(np.int16)
+
+
+def test_backends_draw_the_same_frames(renderers):
+    software, gpu = renderers
+    world = World(7)
+    particles = Snowfall(30, seed=7)
+    for tick in range(600):
+        world.step(INPUT_LEFT if tick // 90 % 2 else INPUT_RIGHT)
+        particles.update()
+        if tick % 100 == 0:
+            # Screen shake draws from the global RNG
+            random.seed(tick)
+            software.draw_world(world, particles)
+            expected = _pixels(software.window)
+            random.seed(tick)
+            gpu.draw_world(world, particles)
+            actual = _pixels(gpu.to_surface())
+            gpu.present()
+            assert np.abs(expected - actual).max() <= TOLERANCE, f'tick {tick}'
@@ -0,0 +1,55 @@
+from river_adventure_game.constants import WINDOW_WIDTH, WINDOW_HEIGHT, PLAYER_SPEED
+from river_adventure_game.level import (
+    LevelGenerator, CHUNK_TICKS, RAMP_CHUNKS, STONE, generate_chunk,
+)
+from river_adventure_game.world import Boat, Stone
+
+
+def _hit_free_ticks(seed, ticks):
+    """Step the river's stones and track every boat x that has dodged them all.
+
+    Follows World.step: the boat moves, the tick's stones spawn, every
+    stone moves and then the boat is checked against them. Returns the
+    number of ticks survived.
+    """
+    level = LevelGenerator(seed)
+    boat = Boat()
+    boat_rect = boat.rect.copy()
+    reachable = {boat.x}
+    stones = []
+    for tick in range(1, ticks + 1):
+        moved = set()
+        for x in reachable:
+            moved.add(x)
+            if x > 0:
+                moved.add(x - PLAYER_SPEED)
+            if x < WINDOW_WIDTH - boat.width:
+                moved.add(x + PLAYER_SPEED)
+        stones.extend(Stone(x) for kind, x in level.spawns(tick) if kind == STONE)
+        for stone in stones:
+            stone.update()
+        stones = [stone for stone in stones if stone.y <= WINDOW_HEIGHT]
+        for stone in stones:
+            boat_rect.x = stone.x
+            if boat_rect.colliderect(stone.rect):
+                # Alongside the boat, rule out every x overlapping it
+                moved = {x for x in moved
+                         if x >= stone.x + stone.width or x + boat.width <= stone.x}
+        reachable = moved
+        if not reachable:
+            return tick
+    level.close()
+    return ticks
+
+
+def test_every_river_has_a_hit_free_path_to_full_difficulty():
+    ticks = (RAMP_CHUNKS + 2) * CHUNK_TICKS
+    for seed in range(12):
+        assert _hit_free_ticks(seed, ticks) == ticks, f'seed {seed}'
+
+
+def test_chunks_do_not_depend_on_order():
+    spawns = generate_chunk(42, 17).spawns
+    for index in (3, 17, 40):
+        generate_chunk(42, index)
+    assert generate_chunk(42, 17).spawns == spawns
@@ -0,0 +1,37 @@
+from river_adventure_game.multiplayer import SharedWorld
+
+
+def _kill(world, player_id):
+    player = world.players[player_id]
+    player.boat.health = 0
+    player.alive = False
+    world.step()
+
+
+def test_last_living_player_leaving_ends_the_game():
+    world = SharedWorld(1)
+    world.add_player(0)
+    world.add_player(1)
+    _kill(world, 0)
+    assert not world.game_over
+
+    world.remove_player(1)
+    assert world.game_over
+
+
+def test_game_goes_on_while_someone_is_alive():
+    world = SharedWorld(1)
+    for player_id in range(3):
+        world.add_player(player_id)
+    _kill(world, 0)
+    world.remove_player(1)
+    assert not world.game_over
+    _kill(world, 2)
+    assert world.game_over
+
+
+def test_empty_world_is_not_over():
+    world = SharedWorld(1)
+    world.add_player(0)
+    world.remove_player(0)
+    assert not world.game_over
@@ -0,0 +1,53 @@
+import pytest
+
+from river_adventure_game.level import LevelGenerator
+from river_adventure_game.masks import SpriteMasks
+from river_adventure_game.replay import MAX_SEED, Recorder, Replay, simulate, verify
+from river_adventure_game.world import World, INPUT_LEFT, INPUT_RIGHT
+
+
+def _play(world, ticks=1500):
+    recorder = Recorder(world)
+    for tick in range(ticks):
+        inputs = INPUT_LEFT if tick // 70 % 2 else INPUT_RIGHT
+        world.step(inputs)
+        recorder.record(inputs)
+    return recorder
+
+
+@pytest.mark.parametrize('seed', [0, 1, 12345, MAX_SEED])
+def test_saved_replays_load_and_verify(tmp_path, seed):
+    world = World(seed)
+    path = tmp_path / 'run.rar'
+    _play(world).save(path)
+
+    replay = Replay.load(path)
+    assert (replay.seed, replay.score, replay.health) == (seed, world.score, world.boat.health)
+    assert verify(replay)
+    assert simulate(replay).ticks == world.ticks
+
+
+@pytest.mark.parametrize('seed', [0, MAX_SEED])
+def test_chunked_precise_replays_verify(tmp_path, seed):
+    world = World(seed, level=LevelGenerator(seed), masks=SpriteMasks())
+    path = tmp_path / 'run.rar'
+    _play(world).save(path)
+    world.level.close()
+
+    replay = Replay.load(path)
+    assert replay.chunked and replay.precise
+    assert verify(replay)
+
+
+def test_tampered_score_fails_verification(tmp_path):
+    replay = _play(World(7)).replay()
+    replay.score += 10
+    assert not verify(Replay.from_bytes(replay.to_bytes()))
+
+
+@pytest.mark.parametrize('seed', [-1, MAX_SEED + 1])
+def test_seeds_that_do_not_fit_are_refused_before_playing(seed):
+    with pytest.raises(ValueError):
+        Recorder(World(seed))
+    with pytest.raises(ValueError):
+        Replay(seed, b'')